@@ -1,4 +1,4 @@
 # run_real.sh
 #!/bin/bash
 echo "Запуск веб-интерфейса с реальным оборудованием..."
-python3 -m src.web_interface --port 5000 --host 0.0.0.0
\ No newline at end of file
+python3 src/web_interface.py --port 5000 --host 0.0.0.0
\ No newline at end of file
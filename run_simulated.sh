@@ -1,4 +1,4 @@
 # run_simulated.sh
 #!/bin/bash
 echo "Запуск веб-интерфейса в режиме симуляции..."
-python3 -m src.web_interface --simulate --port 5000 --host 0.0.0.0
\ No newline at end of file
+python3 src/web_interface.py --simulate --port 5000 --host 0.0.0.0
\ No newline at end of file
@@ -0,0 +1,202 @@
+import json
+import time
+import logging
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger("Calibration")
+
+
+class CompensationTable:
+    """Таблица коррекции угла на равномерной сетке узлов.
+
+    Коррекция - добавка к команде: чтобы попасть в угол a, ось нужно
+    отправить в a + correction(a). Значения в узлах подбираются методом
+    наименьших квадратов по кусочно-линейному базису; нормальные уравнения
+    трехдиагональные и накапливаются, поэтому новые точки можно добавлять
+    по одной с пересчетом за O(n).
+    """
+
+    def __init__(self, min_angle: float, max_angle: float, nodes: int = 33,
+                 smoothing: float = 1e-3):
+        if nodes < 2 or max_angle <= min_angle:
+            raise ValueError("Некорректные параметры сетки коррекции")
+
+        self.min_angle = min_angle
+        self.max_angle = max_angle
+        self.nodes = nodes
+        self.smoothing = smoothing
+        self.inv_step = (nodes - 1) / (max_angle - min_angle)
+
+        self._diag = [0.0] * nodes
+        self._off = [0.0] * (nodes - 1)
+        self._rhs = [0.0] * nodes
+        self.sample_count = 0
+
+        self.values = [0.0] * nodes
+        self._slopes = [0.0] * (nodes - 1)
+
+    def correction(self, angle: float) -> float:
+        """Интерполяция коррекции за O(1)"""
+        u = (angle - self.min_angle) * self.inv_step
+        if u <= 0.0:
+            return self.values[0]
+        i = int(u)
+        if i >= self.nodes - 1:
+            return self.values[-1]
+        return self.values[i] + self._slopes[i] * (u - i)
+
+    def add_sample(self, angle: float, correction: float, weight: float = 1.0):
+        """Накопление точки без пересчета узлов"""
+        u = (angle - self.min_angle) * self.inv_step
+        u = min(max(u, 0.0), self.nodes - 1.0)
+        i = min(int(u), self.nodes - 2)
+        f = u - i
+        a, b = (1.0 - f) * weight, f * weight
+
+        self._diag[i] += (1.0 - f) * a
+        self._diag[i + 1] += f * b
+        self._off[i] += (1.0 - f) * b
+        self._rhs[i] += a * correction
+        self._rhs[i + 1] += b * correction
+        self.sample_count += 1
+
+    def update(self, angle: float, correction: float, weight: float = 1.0):
+        """Инкрементальное уточнение таблицы одной точкой"""
+        self.add_sample(angle, correction, weight)
+        self.solve()
+
+    def fit(self, samples: List[Tuple[float, float]]):
+        """Пакетная подгонка по списку пар (угол, коррекция)"""
+        for angle, correction in samples:
+            self.add_sample(angle, correction)
+        self.solve()
+
+    def solve(self):
+        """Решение нормальных уравнений методом прогонки"""
+        n = self.nodes
+        lam = self.smoothing
+        # Штраф на разности соседних узлов сохраняет трехдиагональность
+        # и доопределяет узлы, в которые не попало ни одной точки
+        diag = [d + lam * (2.0 if 0 < i < n - 1 else 1.0) + 1e-12
+                for i, d in enumerate(self._diag)]
+        off = [o - lam for o in self._off]
+        rhs = list(self._rhs)
+
+        c = [0.0] * (n - 1)
+        d = [0.0] * n
+        c[0] = off[0] / diag[0]
+        d[0] = rhs[0] / diag[0]
+        for i in range(1, n):
+            denom = diag[i] - off[i - 1] * c[i - 1]
+            if i < n - 1:
+                c[i] = off[i] / denom
+            d[i] = (rhs[i] - off[i - 1] * d[i - 1]) / denom
+
+        values = [0.0] * n
+        values[-1] = d[-1]
+        for i in range(n - 2, -1, -1):
+            values[i] = d[i] - c[i] * values[i + 1]
+
+        self.values = values
+        self._slopes = [values[i + 1] - values[i] for i in range(n - 1)]
+
+    def to_dict(self) -> Dict:
+        return {
+            'min_angle': self.min_angle,
+            'max_angle': self.max_angle,
+            'nodes': self.nodes,
+            'smoothing': self.smoothing,
+            'sample_count': self.sample_count,
+            'diag': self._diag,
+            'off': self._off,
+            'rhs': self._rhs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CompensationTable':
+        table = cls(data['min_angle'], data['max_angle'], data['nodes'], data['smoothing'])
+        table._diag = [float(v) for v in data['diag']]
+        table._off = [float(v) for v in data['off']]
+        table._rhs = [float(v) for v in data['rhs']]
+        table.sample_count = int(data.get('sample_count', 0))
+        table.solve()
+        return table
+
+
+def save_tables(path: str, tables: Dict[str, CompensationTable]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({axis: table.to_dict() for axis, table in tables.items()}, f, indent=2)
+
+
+def load_tables(path: str) -> Dict[str, CompensationTable]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {axis: CompensationTable.from_dict(table) for axis, table in data.items()}
+
+
+class Calibrator:
+    """Прогон оси по плотной сетке углов с ожиданием успокоения"""
+
+    def __init__(self, control_system, measure: Callable[[str], float] = None,
+                 settle_tolerance: float = 0.005, settle_samples: int = 3,
+                 poll_interval: float = 0.01, settle_timeout: float = 2.0):
+        self.system = control_system
+        self.measure = measure or control_system.measure_angle
+        self.settle_tolerance = settle_tolerance
+        self.settle_samples = settle_samples
+        self.poll_interval = poll_interval
+        self.settle_timeout = settle_timeout
+
+    def wait_for_settle(self, axis: str) -> float:
+        """Ожидание, пока показания датчика перестанут меняться"""
+        readings = [self.measure(axis)]
+        deadline = time.monotonic() + self.settle_timeout
+
+        while True:
+            window = readings[-self.settle_samples:]
+            if len(window) >= self.settle_samples and max(window) - min(window) <= self.settle_tolerance:
+                return sum(window) / len(window)
+            if time.monotonic() >= deadline:
+                logger.warning(f"Ось {axis} не успокоилась за {self.settle_timeout} с")
+                return readings[-1]
+            time.sleep(self.poll_interval)
+            readings.append(self.measure(axis))
+
+    def sweep(self, axis: str, angles: List[float]) -> List[Tuple[float, float]]:
+        """Прогон по списку углов, возвращает пары (команда, измеренный угол)"""
+        # Без датчика прогон бессмысленен: отказываем до первого движения
+        self.measure(axis)
+        speed = self.system.axes[axis].max_speed
+        results = []
+        for angle in angles:
+            if not self.system.move_to_coordinates({axis: angle}, speed):
+                logger.error(f"Не удалось переместить ось {axis} в {angle}°")
+                continue
+            results.append((angle, self.wait_for_settle(axis)))
+        return results
+
+    def calibrate_axis(self, axis: str, points: int = 64, nodes: int = 33) -> CompensationTable:
+        """Построение таблицы коррекции по плотному прогону оси"""
+        config = self.system.axes[axis]
+        step = (config.max_angle - config.min_angle) / (points - 1)
+        angles = [config.min_angle + i * step for i in range(points)]
+
+        # Прогон выполняется без старой таблицы, чтобы измерить исходную ошибку
+        previous = self.system.compensation.pop(axis, None)
+        try:
+            results = self.sweep(axis, angles)
+        finally:
+            if previous is not None:
+                self.system.compensation[axis] = previous
+
+        table = CompensationTable(config.min_angle, config.max_angle, nodes)
+        # Команда c привела в угол m, значит для цели m нужна добавка c - m
+        table.fit([(measured, commanded - measured) for commanded, measured in results])
+
+        residual = max((abs(commanded - measured - table.correction(measured))
+                        for commanded, measured in results), default=0.0)
+        logger.info(f"Ось {axis}: таблица коррекции по {len(results)} точкам, "
+                    f"остаточная ошибка {residual:.4f}°")
+
+        self.system.compensation[axis] = table
+        return table
@@ -1,5 +1,8 @@
+import json
+import os
+import runpy
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Any, Dict, List
 
 @dataclass
 class AxisConfig:
@@ -53,15 +56,212 @@ DEFAULT_JOG_CONFIG = {
     )
 }
 
+# Джог для осей без явной настройки: шаги задаются долей диапазона оси
+# (для оси 0..360° это Δ₀ = 0.1°, Δ_max = 10°)
+JOG_DEFAULTS = {
+    'initial_fraction': 1.0 / 3600.0,
+    'ratio': 2.0,
+    'max_fraction': 1.0 / 36.0,
+    'reset_timeout': 2.0
+}
+
 DEFAULT_PIN_CONFIG = {
     'horizontal': [17, 18, 27, 22],
     'vertical': [23, 24, 25, 4],
     'endstops': [5, 6]
 }
 
+# Журнал положения осей (восстановление после перезапуска без поиска нуля)
+JOURNAL_CONFIG = {
+    'enabled': True,
+    'path': 'stepper_position.journal'
+}
+
+# Таблицы коррекции погрешности позиционирования
+CALIBRATION_CONFIG = {
+    'path': 'calibration.json',
+    'sweep_points': 64,
+    'nodes': 33
+}
+
+# Модель кинематики для преобразования координат цели в углы осей
+# (см. kinematics.KINEMATICS_MODELS)
+KINEMATICS_CONFIG = {
+    'model': 'pan_tilt',
+    'pan_axis': 'horizontal',
+    'tilt_axis': 'vertical'
+}
+
+# Запретные зоны в пространстве углов: каждая траектория проверяется
+# по отрезкам. Пример:
+# {'name': 'fixture', 'bounds': {'horizontal': [100.0, 140.0], 'vertical': [0.0, 30.0]}}
+KEEP_OUT_ZONES = []
+
 # Настройки логирования
 LOG_CONFIG = {
     'level': 'INFO',
     'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     'filename': 'stepper_system.log'
-}
\ No newline at end of file
+}
+
+# Аппаратный драйвер по умолчанию (см. hardware_interface.BACKENDS)
+DEFAULT_BACKEND = 'rpi'
+
+# Параметры драйверов, передаются в конструктор выбранного драйвера
+BACKEND_OPTIONS = {
+    'pigpio_wave': {
+        'host': 'localhost',
+        'port': 8888,
+        'step_rate': 500.0,     # шагов/с на ось
+        'chunk_pulses': 500     # импульсов в одной волне двойного буфера
+    }
+}
+
+# Несколько установок в одном сервисе (web_interface.py --fleet <файл>).
+# rigs: имя установки -> путь к ее файлу конфигурации (относительно файла
+# парка) или словарь разделов, как в .json. sync_timeout - сколько ждать,
+# пока все установки освободятся для синхронного перемещения.
+FLEET_CONFIG = {
+    'rigs': {},
+    'sync_timeout': 10.0
+}
+
+# Имена, занятые общими маршрутами API (/api/fleet/..., /api/track/...)
+RESERVED_RIG_NAMES = {'fleet', 'track'}
+
+
+def build_axes_config(axes_data: Dict[str, Dict]) -> Dict[str, AxisConfig]:
+    """Преобразование словаря конфигурации осей в объекты AxisConfig"""
+    axes_config = {}
+    for axis_name, axis_data in axes_data.items():
+        axes_config[axis_name] = AxisConfig(
+            name=axis_name,
+            steps_per_degree=axis_data['steps_per_degree'],
+            max_angle=axis_data['max_angle'],
+            min_angle=axis_data['min_angle'],
+            homing_pin=axis_data['homing_pin'],
+            max_speed=axis_data.get('max_speed', 10.0),
+            holding_torque=axis_data.get('holding_torque', True)
+        )
+    return axes_config
+
+
+def load_config(path: str = None) -> Dict[str, Any]:
+    """Загрузка конфигурации из файла (.json или .py) поверх значений по умолчанию
+
+    В .py файле используются те же имена, что и в этом модуле
+    (AXES_CONFIG/DEFAULT_AXES_CONFIG, PIN_CONFIG, JOG_CONFIG, ...),
+    в .json - ключи 'axes', 'pins', 'jog', 'journal', 'calibration',
+    'kinematics', 'keep_out', 'backend', 'backend_options'.
+    """
+    if not path:
+        return merge_config({})
+
+    if path.endswith('.py'):
+        namespace = runpy.run_path(path)
+        names = {
+            'axes': ('AXES_CONFIG', 'DEFAULT_AXES_CONFIG'),
+            'pins': ('PIN_CONFIG', 'DEFAULT_PIN_CONFIG'),
+            'jog': ('JOG_CONFIG', 'DEFAULT_JOG_CONFIG'),
+            'journal': ('JOURNAL_CONFIG',),
+            'calibration': ('CALIBRATION_CONFIG',),
+            'kinematics': ('KINEMATICS_CONFIG',),
+            'keep_out': ('KEEP_OUT_ZONES',),
+            'backend': ('BACKEND', 'DEFAULT_BACKEND'),
+            'backend_options': ('BACKEND_OPTIONS',)
+        }
+        data = {}
+        for key, candidates in names.items():
+            for name in candidates:
+                if name in namespace:
+                    data[key] = namespace[name]
+                    break
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    return merge_config(data)
+
+
+def merge_config(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Наложение разделов конфигурации (ключи как в .json) на значения по умолчанию"""
+    config = {
+        'axes': DEFAULT_AXES_CONFIG,
+        'pins': DEFAULT_PIN_CONFIG,
+        'jog': DEFAULT_JOG_CONFIG,
+        'journal': JOURNAL_CONFIG,
+        'calibration': CALIBRATION_CONFIG,
+        'kinematics': KINEMATICS_CONFIG,
+        'keep_out': KEEP_OUT_ZONES,
+        'backend': DEFAULT_BACKEND,
+        'backend_options': BACKEND_OPTIONS
+    }
+    unknown = set(data) - set(config)
+    if unknown:
+        raise ValueError(f"Неизвестные разделы конфигурации: {sorted(unknown)}")
+
+    config.update(data)
+    config['jog'] = {
+        axis: jog if isinstance(jog, JogConfig) else JogConfig(**jog)
+        for axis, jog in config['jog'].items()
+    }
+    return config
+
+
+def build_jog_config(axes_config: Dict[str, AxisConfig],
+                     jog_config: Dict[str, JogConfig] = None) -> Dict[str, JogConfig]:
+    """Настройки джога для каждой оси: явные из jog_config или выведенные из диапазона"""
+    jog_config = jog_config or {}
+    result = {}
+    for axis_name, axis in axes_config.items():
+        if axis_name in jog_config:
+            result[axis_name] = jog_config[axis_name]
+            continue
+        travel = axis.max_angle - axis.min_angle
+        result[axis_name] = JogConfig(
+            delta_initial=travel * JOG_DEFAULTS['initial_fraction'],
+            ratio=JOG_DEFAULTS['ratio'],
+            delta_max=travel * JOG_DEFAULTS['max_fraction'],
+            reset_timeout=JOG_DEFAULTS['reset_timeout']
+        )
+    return result
+
+def load_fleet_config(path: str) -> Dict[str, Any]:
+    """Загрузка конфигурации парка установок из файла (.json или .py с FLEET_CONFIG)
+
+    Возвращает {'rigs': {имя: конфигурация как у load_config}, 'sync_timeout': ...}.
+    Установкам, оставившим пути журнала и таблиц коррекции по умолчанию,
+    к имени файла добавляется имя установки, чтобы они не писали в один файл.
+    """
+    if path.endswith('.py'):
+        data = runpy.run_path(path).get('FLEET_CONFIG', {})
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    unknown = set(data) - set(FLEET_CONFIG)
+    if unknown:
+        raise ValueError(f"Неизвестные разделы конфигурации парка: {sorted(unknown)}")
+    if not data.get('rigs'):
+        raise ValueError("В конфигурации парка не задано ни одной установки")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    rigs = {}
+    for name, rig_data in data['rigs'].items():
+        if name in RESERVED_RIG_NAMES or '/' in name:
+            raise ValueError(f"Недопустимое имя установки: {name}")
+        if isinstance(rig_data, str):
+            config = load_config(os.path.join(base_dir, rig_data))
+        else:
+            config = merge_config(rig_data)
+
+        for section, defaults in (('journal', JOURNAL_CONFIG), ('calibration', CALIBRATION_CONFIG)):
+            if config[section]['path'] == defaults['path']:
+                config[section] = dict(config[section], path=f"{name}_{defaults['path']}")
+        rigs[name] = config
+
+    journals = [config['journal']['path'] for config in rigs.values() if config['journal'].get('enabled')]
+    if len(set(journals)) != len(journals):
+        raise ValueError("Установки парка используют общий файл журнала положения")
+
+    return {'rigs': rigs, 'sync_timeout': float(data.get('sync_timeout', FLEET_CONFIG['sync_timeout']))}
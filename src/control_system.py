@@ -1,9 +1,16 @@
+from array import array
 from enum import Enum
-from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 import threading
 import time
 import logging
+from config import AxisConfig, JogConfig, DEFAULT_JOG_CONFIG, CALIBRATION_CONFIG, build_jog_config
+from position_journal import PositionJournal
+from calibration import Calibrator, CompensationTable, save_tables
+from kinematics import KinematicsModel, IdentityKinematics
+from tracking import TargetTracker
+from keep_out import KeepOutZone, KeepOutIndex
+from hardware_interface import MotionAborted
 
 logger = logging.getLogger("StepperControlSystem")
 
@@ -11,6 +18,7 @@ class OperationMode(Enum):
     WORKING = "working"
     CALIBRATION = "calibration"
     HOMING = "homing"
+    TRACKING = "tracking"
 
 class MovementCommand(Enum):
     MOVE = "move"
@@ -19,117 +27,369 @@ class MovementCommand(Enum):
     STOP = "stop"
     HOME = "home"
 
-@dataclass
-class AxisConfig:
-    name: str
-    steps_per_degree: float
-    max_angle: float
-    min_angle: float
-    homing_pin: int
-    max_speed: float = 10.0
-    holding_torque: bool = True
-
-@dataclass
-class JogConfig:
-    delta_initial: float
-    ratio: float
-    delta_max: float
-    reset_timeout: float
-
 class StepperControlSystem:
-    def __init__(self, axes_config: Dict[str, AxisConfig], hardware_interface):
+    TRAJECTORY_POINTS = 50
+
+    def __init__(self, axes_config: Dict[str, AxisConfig], hardware_interface,
+                 journal: Optional[PositionJournal] = None,
+                 jog_config: Dict[str, JogConfig] = None,
+                 kinematics: Optional[KinematicsModel] = None,
+                 keep_out_zones: List[KeepOutZone] = None,
+                 calibration_config: Dict = None):
         self.axes = axes_config
         self.hw = hardware_interface
+        self.journal = journal
+        self.kinematics = kinematics if kinematics is not None else IdentityKinematics()
+        self.tracker: Optional[TargetTracker] = None
         self.mode = OperationMode.WORKING
-        self.current_angles = {name: 0.0 for name in axes_config}
-        self.target_angles = {name: 0.0 for name in axes_config}
-        self.is_holding = {name: False for name in axes_config}
-        
-        self.jog_config = {
-            'horizontal': JogConfig(0.1, 2.0, 10.0, 2.0),
-            'vertical': JogConfig(0.05, 1.8, 5.0, 1.5)
-        }
-        
-        self.jog_multipliers = {name: 0 for name in axes_config}
-        self.last_jog_time = {name: 0.0 for name in axes_config}
+        self.compensation: Dict[str, CompensationTable] = {}
+        # Без явной конфигурации таблицы коррекции не сохраняются на диск
+        self.calibration_config = (calibration_config if calibration_config is not None
+                                   else dict(CALIBRATION_CONFIG, path=None))
+
+        # Состояние осей хранится в непрерывных массивах, индекс - номер оси
+        # в axis_names. Планирование, проверка и исполнение работают сразу
+        # с векторами всех осей, а не со словарями по имени.
+        self.axis_names = list(axes_config)
+        self.axis_index = {name: i for i, name in enumerate(self.axis_names)}
+        n = len(self.axis_names)
+        self.angles = array('d', [0.0]) * n
+        self.steps = array('q', [0]) * n
+        self.targets = array('d', [0.0]) * n
+        self.holding = array('b', [0]) * n
+        self.trusted = array('b', [0]) * n
+        self.jog_counts = array('i', [0]) * n
+        self.jog_times = array('d', [0.0]) * n
+        self._load_axis_arrays()
+
+        self.keep_out = None
+        if keep_out_zones:
+            self.keep_out = KeepOutIndex(keep_out_zones, self.axis_names,
+                                         self.min_angles, self.max_angles)
+
+        self.jog_config = build_jog_config(
+            axes_config, jog_config if jog_config is not None else DEFAULT_JOG_CONFIG)
+        self._load_jog_arrays()
+        self.is_ready = False
+
+        # Доли пути для точек траектории не зависят от цели и считаются один раз
+        self._trajectory_ratios = [i / (self.TRAJECTORY_POINTS - 1)
+                                   for i in range(self.TRAJECTORY_POINTS)]
         
         self.command_queue = []
         self.is_running = True
-        self.lock = threading.Lock()
+        self.lock = threading.RLock()
+        # Аварийная остановка: флаг проверяется драйвером во время движения
+        self.stop_event = threading.Event()
+
+        if self.journal is not None:
+            self._restore_from_journal()
         
         self.worker_thread = threading.Thread(target=self._command_worker)
         self.worker_thread.daemon = True
         self.worker_thread.start()
 
+    def _load_axis_arrays(self):
+        """Параметры осей из AxisConfig в массивы (после изменения конфигурации)"""
+        configs = [self.axes[name] for name in self.axis_names]
+        self.min_angles = array('d', [c.min_angle for c in configs])
+        self.max_angles = array('d', [c.max_angle for c in configs])
+        self.steps_per_degree = array('d', [c.steps_per_degree for c in configs])
+        self.max_speeds = array('d', [c.max_speed for c in configs])
+
+    def _load_jog_arrays(self):
+        configs = [self.jog_config[name] for name in self.axis_names]
+        self.jog_delta_initial = array('d', [c.delta_initial for c in configs])
+        self.jog_ratio = array('d', [c.ratio for c in configs])
+        self.jog_delta_max = array('d', [c.delta_max for c in configs])
+        self.jog_reset_timeout = array('d', [c.reset_timeout for c in configs])
+
+    def _axes_dict(self, values) -> Dict[str, float]:
+        return dict(zip(self.axis_names, values))
+
+    # Представления состояния по именам осей (для API и журналов)
+    @property
+    def current_angles(self) -> Dict[str, float]:
+        return self._axes_dict(self.angles)
+
+    @property
+    def current_steps(self) -> Dict[str, int]:
+        return self._axes_dict(self.steps)
+
+    @property
+    def target_angles(self) -> Dict[str, float]:
+        return self._axes_dict(self.targets)
+
+    @property
+    def is_holding(self) -> Dict[str, bool]:
+        return {name: bool(v) for name, v in zip(self.axis_names, self.holding)}
+
+    @property
+    def position_trusted(self) -> Dict[str, bool]:
+        return {name: bool(v) for name, v in zip(self.axis_names, self.trusted)}
+
+    @property
+    def jog_multipliers(self) -> Dict[str, int]:
+        return self._axes_dict(self.jog_counts)
+
+    def get_status(self) -> Dict:
+        """Снимок состояния всех осей"""
+        with self.lock:
+            return {
+                'mode': self.mode.value,
+                'axes': list(self.axis_names),
+                'current_angles': self.current_angles,
+                'target_angles': self.target_angles,
+                'is_holding': self.is_holding,
+                'jog_multipliers': self.jog_multipliers,
+                'position_trusted': self.position_trusted,
+                'homing_required': not all(self.trusted)
+            }
+
+    def _resolve(self, coordinates: Dict[str, float]):
+        """Имена осей -> (индексы, значения); ValueError для неизвестной оси"""
+        indices, values = [], []
+        for axis, angle in coordinates.items():
+            if axis not in self.axis_index:
+                raise ValueError(f"Ось {axis} не найдена")
+            indices.append(self.axis_index[axis])
+            values.append(float(angle))
+        return indices, values
+
+    def _check_limits(self, indices: List[int], values: List[float]):
+        min_angles, max_angles = self.min_angles, self.max_angles
+        for i, angle in zip(indices, values):
+            if not (min_angles[i] <= angle <= max_angles[i]):
+                raise ValueError(f"Угол {angle} вне диапазона для оси {self.axis_names[i]}")
+
     def validate_coordinates(self, coordinates: Dict[str, float]) -> bool:
         try:
             print(f"Валидация координат: {coordinates}")  # Отладочное сообщение
-
-            for axis, angle in coordinates.items():
-                if axis not in self.axes:
-                    print(f"Ось {axis} не найдена в конфигурации")  # Отладочное сообщение
-                    raise ValueError(f"Ось {axis} не найдена")
-
-                min_angle = self.axes[axis].min_angle
-                max_angle = self.axes[axis].max_angle
-                print(f"Ось {axis}: угол {angle}, диапазон [{min_angle}, {max_angle}]")  # Отладочное сообщение
-
-                if not (self.axes[axis].min_angle <= angle <= self.axes[axis].max_angle):
-                    print(f"Угол {angle} вне диапазона для оси {axis}")  # Отладочное сообщение
-                    raise ValueError(f"Угол {angle} вне диапазона для оси {axis}")
-
+            self._check_limits(*self._resolve(coordinates))
             print("Валидация пройдена успешно")  # Отладочное сообщение
             return True
         except (ValueError, TypeError) as e:
             logger.error(f"Ошибка валидации: {e}")
             return False
 
-    @staticmethod
-    def convert_to_angles(coordinates: Dict) -> Dict[str, float]:
-        return coordinates
+    def _restore_from_journal(self):
+        """Восстановление положения осей из журнала после перезапуска"""
+        record = self.journal.load()
+        if record is None:
+            logger.info("Журнал положения пуст, требуется поиск нуля")
+            return
 
-    def plan_trajectory(self, target_angles: Dict[str, float]) -> List[Dict[str, float]]:
-        steps = 50
-        trajectory = []
-        
-        for i in range(steps):
-            ratio = i / (steps - 1)
-            intermediate = {}
-            for axis in target_angles:
-                start = self.current_angles[axis]
-                end = target_angles[axis]
-                intermediate[axis] = start + ratio * (end - start)
-            trajectory.append(intermediate)
-        
-        return trajectory
+        self.angles = array('d', record.angles)
+        self.targets = array('d', record.angles)
+        self.steps = array('q', record.steps)
+        for axis, steps in zip(self.axis_names, self.steps):
+            self.hw.set_position(axis, steps)
+        # Обрыв посреди движения - фактическое положение неизвестно
+        self.trusted = array('b', [int(t and not record.in_motion) for t in record.trusted])
 
-    def execute_movement(self, trajectory: List[Dict[str, float]], delay: float = 0.01):
-        """Выполнение движения по траектории"""
-        print(f"Начало выполнения движения по траектории")  # Отладочное сообщение
+        if record.in_motion:
+            logger.warning("Журнал записан во время движения, положение осей недостоверно")
+        logger.info(f"Положение восстановлено из журнала: {self.current_angles}")
 
-        for i, point in enumerate(trajectory):
+    def _journal_checkpoint(self, in_motion: bool = False):
+        if self.journal is None:
+            return
+        try:
+            self.journal.write(self.angles, self.steps, self.trusted, in_motion)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ошибка записи журнала положения: {e}")
+
+    def is_position_trusted(self, axis: str = None) -> bool:
+        """Можно ли доверять положению оси (или всех осей) без поиска нуля"""
+        if axis is not None:
+            return axis in self.axis_index and bool(self.trusted[self.axis_index[axis]])
+        return all(self.trusted)
+
+    def mark_position_untrusted(self, axis: str = None):
+        indices = [self.axis_index[axis]] if axis is not None else range(len(self.axis_names))
+        with self.lock:
+            for i in indices:
+                self.trusted[i] = 0
+            self._journal_checkpoint()
 
-            print(f"Точка {i + 1}/{len(trajectory)}: {point}")  # Отладочное сообщение
+    def validate_batch(self, angles: Dict[str, List[float]]) -> bool:
+        """Проверка пакета углов, разложенного по осям"""
+        try:
+            for axis, values in angles.items():
+                if axis not in self.axis_index:
+                    raise ValueError(f"Ось {axis} не найдена")
+                i = self.axis_index[axis]
+                if values and (min(values) < self.min_angles[i] or max(values) > self.max_angles[i]):
+                    raise ValueError(f"Углы вне диапазона для оси {axis}")
+            return True
+        except ValueError as e:
+            logger.error(f"Ошибка валидации: {e}")
+            return False
 
-            with self.lock:
-                for axis, angle in point.items():
-                    steps = self._angle_to_steps(axis, angle)
-                    print(f"Ось {axis}: угол {angle} -> {steps} шагов")  # Отладочное сообщение
+    def check_path(self, columns: List[List[float]]) -> bool:
+        """Проверка ломаной (значения по столбцам всех осей) на пересечение запретных зон"""
+        if self.keep_out is None:
+            return True
+        collision = self.keep_out.find_collision(columns)
+        if collision is not None:
+            segment, zone = collision
+            logger.error(f"Траектория пересекает запретную зону {zone} на отрезке {segment + 1}")
+            return False
+        return True
+
+    def convert_batch(self, columns: Dict[str, List[float]]) -> Dict[str, List[float]]:
+        """Пересчет пакета координат (углы осей, x/y/z или азимут/угол места) в углы осей"""
+        return self.kinematics.to_axis_angles(columns)
+
+    def convert_to_angles(self, coordinates: Dict) -> Dict[str, float]:
+        angles = self.convert_batch({key: [value] for key, value in coordinates.items()})
+        return {axis: values[0] for axis, values in angles.items()}
+
+    def _target_vector(self, target_angles: Dict[str, float]) -> array:
+        """Целевой вектор всех осей: неуказанные оси остаются на месте"""
+        target = array('d', self.angles)
+        for i, angle in zip(*self._resolve(target_angles)):
+            target[i] = angle
+        return target
+
+    def plan_trajectory(self, target_angles: Dict[str, float]) -> List[array]:
+        """Линейная интерполяция от текущего вектора углов к целевому"""
+        start = self.angles
+        delta = [end - begin for begin, end in zip(start, self._target_vector(target_angles))]
+        return [array('d', [begin + ratio * d for begin, d in zip(start, delta)])
+                for ratio in self._trajectory_ratios]
+
+    def execute_movement(self, trajectory: List[array], delay: float = 0.01):
+        """Выполнение движения по траектории"""
+        print(f"Начало выполнения движения по траектории")  # Отладочное сообщение
+        if not trajectory:
+            return
 
-                    self.hw.move_axis(axis, steps)
-                    self.current_angles[axis] = angle
-                    print(f"Ось {axis} перемещена в {angle}°")  # Отладочное сообщение
+        with self.lock:
+            schedule, final_steps = self._compile_schedule(trajectory, self._compensation_tables())
+            self._journal_checkpoint(in_motion=True)
+
+            try:
+                # Весь план движения уходит драйверу целиком: драйверы
+                # с аппаратной синхронизацией исполняют его без участия Python
+                self.hw.run_schedule(schedule, delay, self.stop_event)
+                self.steps = final_steps
+                self.angles = array('d', trajectory[-1])
+            except Exception:
+                # Движение оборвалось на неизвестной точке
+                for i, (start, end) in enumerate(zip(self.steps, final_steps)):
+                    if start != end:
+                        self.trusted[i] = 0
+                raise
+            finally:
+                self._journal_checkpoint(in_motion=False)
+
+    def _compile_schedule(self, trajectory: List[array], tables: List[Optional[CompensationTable]]):
+        """Траектория углов -> приращения шагов по точкам и итоговый вектор шагов"""
+        names, steps_per_degree = self.axis_names, self.steps_per_degree
+        previous = array('q', self.steps)
+        schedule = []
+        for point in trajectory:
+            moves = {}
+            for i, angle in enumerate(point):
+                table = tables[i]
+                corrected = angle + table.correction(angle) if table is not None else angle
+                steps = int(corrected * steps_per_degree[i])
+                if steps != previous[i]:
+                    moves[names[i]] = steps - previous[i]
+                    previous[i] = steps
+            schedule.append(moves)
+        return schedule, previous
+
+    def _compensation_tables(self) -> List[Optional[CompensationTable]]:
+        compensation = self.compensation
+        return [compensation.get(name) for name in self.axis_names]
+
+    def _move_axes_to(self, point: array, tables: List[Optional[CompensationTable]]):
+        """Перевод всех осей в вектор углов point одной командой драйверу"""
+        schedule, final_steps = self._compile_schedule([point], tables)
+        if schedule[0]:
+            self.hw.move_axes(schedule[0])
+        self.steps = final_steps
+        self.angles = array('d', point)
+
+    def follow_point(self, indices: List[int], positions: List[float],
+                     velocities: List[float], period: float):
+        """Один такт сопровождения: упреждение по скорости и ограничение max_speed"""
+        with self.lock:
+            if self.stop_event.is_set():
+                return
+            point = array('d', self.angles)
+            for i, position, velocity in zip(indices, positions, velocities):
+                max_delta = self.max_speeds[i] * period
+                command = position + velocity * period
+                command = max(point[i] - max_delta, min(command, point[i] + max_delta))
+                point[i] = max(self.min_angles[i], min(command, self.max_angles[i]))
+                self.targets[i] = position
+            # Ограничение скорости срезает углы потока цели, поэтому проверяется
+            # сам отрезок такта, а не только точки цели из push
+            if not self.check_path([[start, end] for start, end in zip(self.angles, point)]):
+                logger.error("Сопровождение остановлено перед запретной зоной")
+                self.stop_tracking()
+                return
+            self._move_axes_to(point, self._compensation_tables())
+
+    def track(self, samples: List[Dict[str, float]], rate_hz: float = 50.0, time_base: float = None):
+        """Запуск (или продолжение) сопровождения цели по потоку точек"""
+        with self.lock:
+            if self.tracker is not None:
+                self.tracker.push(samples, time_base)
+                return
+            if self.mode != OperationMode.WORKING:
+                raise RuntimeError(f"Сопровождение недоступно в режиме {self.mode.value}")
+            tracker = TargetTracker(self, rate_hz)
+            tracker.push(samples, time_base)
+            self.tracker = tracker
+            self.mode = OperationMode.TRACKING
+            self._journal_checkpoint(in_motion=True)
+            tracker.start()
+
+    def stop_tracking(self):
+        with self.lock:
+            tracker, self.tracker = self.tracker, None
+        if tracker is None:
+            return
+        # Цикл сопровождения берет self.lock на каждом такте, поэтому ждем его вне блокировки
+        tracker.stop()
+        with self.lock:
+            self.mode = OperationMode.WORKING
+            self._journal_checkpoint()
+        logger.info("Сопровождение цели остановлено")
 
-            time.sleep(delay)
+    def warm_up(self):
+        """Прогрев до первого запроса: таблицы фаз драйвера и планировщик"""
+        self.hw.warm_up()
+        with self.lock:
+            self.plan_trajectory({})
+            for axis, angle in self.current_angles.items():
+                self._angle_to_steps(axis, angle)
+        self.is_ready = True
+        logger.info("Система прогрета и готова к работе")
 
     def _angle_to_steps(self, axis: str, angle: float) -> int:
-        return int(angle * self.axes[axis].steps_per_degree)
+        table = self.compensation.get(axis)
+        if table is not None:
+            angle += table.correction(angle)
+        return int(angle * self.steps_per_degree[self.axis_index[axis]])
 
     def _steps_to_angle(self, axis: str, steps: int) -> float:
-        return steps / self.axes[axis].steps_per_degree
+        return steps / self.steps_per_degree[self.axis_index[axis]]
+
+    def measure_angle(self, axis: str) -> float:
+        """Фактический угол оси по датчику (энкодеру)"""
+        measured = self.hw.read_position(axis)
+        if measured is None:
+            # Расчетный угол совпадает с командой и ошибку не показывает
+            raise RuntimeError(f"Нет датчика положения оси {axis}, измерение невозможно")
+        return measured
 
     def set_holding_torque(self, axis: str, enable: bool):
-        self.is_holding[axis] = enable
+        self.holding[self.axis_index[axis]] = int(enable)
         self.hw.set_holding_torque(axis, enable)
         logger.info(f"Ток удержания оси {axis}: {'вкл' if enable else 'выкл'}")
 
@@ -140,20 +400,40 @@ class StepperControlSystem:
         
         threading.Thread(target=delayed_move, daemon=True).start()
 
+    def can_move_to(self, coordinates: Dict[str, float]) -> bool:
+        """Проверка перемещения без движения: координаты, пределы осей и запретные зоны"""
+        if self.tracker is not None:
+            return False
+        try:
+            target_angles = self.convert_to_angles(coordinates)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Ошибка преобразования координат: {e}")
+            return False
+        if not self.validate_coordinates(target_angles):
+            return False
+        with self.lock:
+            trajectory = self.plan_trajectory(target_angles)
+            return self.check_path([list(column) for column in zip(*trajectory)])
+
     def move_to_coordinates(self, coordinates: Dict[str, float], speed: float = None):
 
         print(f"Попытка перемещения в координаты: {coordinates}")  # Отладочное сообщение
-        if not self.validate_coordinates(coordinates):
-            print("Валидация координат не пройдена")  # Отладочное сообщение
+        if self.tracker is not None:
+            logger.error("Перемещение недоступно во время сопровождения цели")
             return False
 
         try:
             target_angles = self.convert_to_angles(coordinates)
-            print(f"Целевые углы: {target_angles}")  # Отладочное сообщение
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Ошибка преобразования координат: {e}")
+            return False
+        print(f"Целевые углы: {target_angles}")  # Отладочное сообщение
 
-            trajectory = self.plan_trajectory(target_angles)
-            print(f"Сгенерировано точек траектории: {len(trajectory)}")  # Отладочное сообрование
+        if not self.validate_coordinates(target_angles):
+            print("Валидация координат не пройдена")  # Отладочное сообщение
+            return False
 
+        try:
             delay = 0.01  # значение по умолчанию
             if speed is not None:
                 # Преобразуем скорость в задержку между шагами
@@ -161,10 +441,16 @@ class StepperControlSystem:
                 delay = max(0.001, min(0.1, 1.0 / (speed * 10)))
 
             with self.lock:
-                self.target_angles = target_angles
+                trajectory = self.plan_trajectory(target_angles)
+                print(f"Сгенерировано точек траектории: {len(trajectory)}")  # Отладочное сообщение
+
+                if not self.check_path([list(column) for column in zip(*trajectory)]):
+                    return False
+
+                self.targets = array('d', trajectory[-1])
                 self.execute_movement(trajectory, delay)
 
-                for axis in coordinates:
+                for axis in target_angles:
                     self.set_holding_torque(axis, True)
 
             print("Перемещение успешно завершено")  # Отладочное сообщение
@@ -175,60 +461,86 @@ class StepperControlSystem:
             return False
 
     def stop_movement(self):
+        # Текущее движение держит self.lock до конца, поэтому флаг и остановка
+        # драйвера - без блокировки; движение прерывается и отпускает ее
+        self.stop_event.set()
+        self.hw.emergency_stop()
+        self.stop_tracking()
         with self.lock:
-            self.hw.emergency_stop()
-            for axis in self.axes:
+            for axis in self.axis_names:
                 self.set_holding_torque(axis, False)
+            self._journal_checkpoint()
+            self.stop_event.clear()
 
     def home_axis(self, axis: str):
-        if axis not in self.axes:
+        if axis not in self.axis_index:
             logger.error(f"Ось {axis} не найдена")
             return
         
-        self.mode = OperationMode.HOMING
+        i = self.axis_index[axis]
         homing_pin = self.axes[axis].homing_pin
-        
-        while not self.hw.read_endstop(homing_pin):
-            self.hw.move_axis(axis, -10)
-            time.sleep(0.1)
-        
-        self.hw.move_axis(axis, 50)
-        time.sleep(0.5)
-        
-        while not self.hw.read_endstop(homing_pin):
-            self.hw.move_axis(axis, -1)
-            time.sleep(0.05)
-        
+        # Поиск нуля - такое же движение, как перемещение: держит self.lock,
+        # а stop_movement прерывает его через stop_event
         with self.lock:
-            self.current_angles[axis] = 0.0
-            self.target_angles[axis] = 0.0
-        
-        self.mode = OperationMode.WORKING
+            self.mode = OperationMode.HOMING
+            self.trusted[i] = 0
+            self._journal_checkpoint(in_motion=True)
+            try:
+                while not self.hw.read_endstop(homing_pin):
+                    self._check_stop(axis)
+                    self.hw.move_axis(axis, -10)
+                    self.stop_event.wait(0.1)
+
+                self._check_stop(axis)
+                self.hw.move_axis(axis, 50)
+                self.stop_event.wait(0.5)
+
+                while not self.hw.read_endstop(homing_pin):
+                    self._check_stop(axis)
+                    self.hw.move_axis(axis, -1)
+                    self.stop_event.wait(0.05)
+
+                self.angles[i] = 0.0
+                self.targets[i] = 0.0
+                self.steps[i] = 0
+                # Нуль шагов - нулевая фаза обмоток (сдвиг нуля не больше двух шагов)
+                self.hw.set_position(axis, 0)
+                self.trusted[i] = 1
+            finally:
+                self.mode = OperationMode.WORKING
+                self._journal_checkpoint()
+
         logger.info(f"Ось {axis} приведена в нулевое положение")
 
+    def _check_stop(self, axis: str):
+        if self.stop_event.is_set():
+            logger.warning(f"Поиск нуля оси {axis} прерван, положение недостоверно")
+            raise MotionAborted(f"Поиск нуля оси {axis} прерван аварийной остановкой")
+
     def geometric_jog(self, axis: str, direction: int):
         """Геометрический джог с проверкой границ"""
-        if axis not in self.jog_config:
+        if axis not in self.axis_index:
             logger.error(f"Конфигурация джога для оси {axis} не найдена")
             return
 
-        config = self.jog_config[axis]
+        i = self.axis_index[axis]
+        ratio = self.jog_ratio[i]
         current_time = time.time()
 
         # Сброс множителя при превышении таймаута
-        if current_time - self.last_jog_time[axis] > config.reset_timeout:
-            self.jog_multipliers[axis] = 0
+        if current_time - self.jog_times[i] > self.jog_reset_timeout[i]:
+            self.jog_counts[i] = 0
 
         # Расчет текущего шага
-        delta = config.delta_initial * (config.ratio ** self.jog_multipliers[axis])
-        delta = min(delta, config.delta_max) * direction
+        delta = self.jog_delta_initial[i] * (ratio ** self.jog_counts[i])
+        delta = min(delta, self.jog_delta_max[i]) * direction
 
         # Вычисление целевого угла с проверкой границ
-        target_angle = self.current_angles[axis] + delta
-        target_angle = max(self.axes[axis].min_angle, min(target_angle, self.axes[axis].max_angle))
+        current_angle = self.angles[i]
+        target_angle = max(self.min_angles[i], min(current_angle + delta, self.max_angles[i]))
 
         # Если угол не изменился (достигнут предел), не выполняем движение
-        if abs(target_angle - self.current_angles[axis]) < 0.001:
+        if abs(target_angle - current_angle) < 0.001:
             logger.info(f"Ось {axis} достигла предела: {target_angle}°")
             return
 
@@ -236,39 +548,77 @@ class StepperControlSystem:
         self.move_to_coordinates({axis: target_angle})
 
         # Увеличение множителя для следующего шага
-        self.jog_multipliers[axis] += 1
-        self.last_jog_time[axis] = current_time
+        self.jog_counts[i] += 1
+        self.jog_times[i] = current_time
 
         logger.info(
-            f"Джог оси {axis}: Δ={delta:.3f}°, текущий угол: {target_angle:.1f}°, множитель ×{config.ratio ** self.jog_multipliers[axis]:.1f}")
+            f"Джог оси {axis}: Δ={delta:.3f}°, текущий угол: {target_angle:.1f}°, множитель ×{ratio ** self.jog_counts[i]:.1f}")
 
     def reset_jog_multiplier(self, axis: str):
-        self.jog_multipliers[axis] = 0
+        self.jog_counts[self.axis_index[axis]] = 0
         logger.info(f"Множитель джога оси {axis} сброшен")
 
-    def calibrate_scale(self, axis: str, known_angle: float, measured_steps: int):
-        if axis not in self.axes:
+    def calibrate_scale(self, axis: str, known_angle: float, measured_steps: int,
+                        incremental: bool = False):
+        if axis not in self.axis_index:
             logger.error(f"Ось {axis} не найдена")
             return
-        
+
+        i = self.axis_index[axis]
+        if incremental:
+            # Уточняем таблицу коррекции в одной точке, шкала оси не меняется
+            config = self.axes[axis]
+            commanded_angle = measured_steps / self.steps_per_degree[i]
+            with self.lock:
+                table = self.compensation.get(axis)
+                if table is None:
+                    table = CompensationTable(config.min_angle, config.max_angle,
+                                              self.calibration_config['nodes'])
+                    self.compensation[axis] = table
+                table.update(known_angle, commanded_angle - known_angle)
+                self.save_compensation()
+            logger.info(f"Ось {axis}: коррекция в точке {known_angle}° = "
+                        f"{table.correction(known_angle):.4f}°")
+            return
+
         new_steps_per_degree = measured_steps / known_angle
-        self.axes[axis].steps_per_degree = new_steps_per_degree
+        with self.lock:
+            self.axes[axis].steps_per_degree = new_steps_per_degree
+            self.steps_per_degree[i] = new_steps_per_degree
+            # Таблица коррекции построена для старой шкалы и больше не верна
+            if self.compensation.pop(axis, None) is not None:
+                logger.warning(f"Ось {axis}: таблица коррекции сброшена, требуется новый прогон")
+                self.save_compensation()
+            # Положение в шагах не меняется, пересчитываем его в градусы по новой шкале
+            self.angles[i] = self.steps[i] / new_steps_per_degree
+            self._journal_checkpoint()
         logger.info(f"Ось {axis} откалибрована: {new_steps_per_degree:.3f} шагов/градус")
 
     def check_linearity(self, axis: str, test_angles: List[float]):
         errors = []
-        for target_angle in test_angles:
-            self.move_to_coordinates({axis: target_angle})
-            time.sleep(1)
-            
-            measured_angle = self.current_angles[axis]
+        for target_angle, measured_angle in Calibrator(self).sweep(axis, test_angles):
             error = measured_angle - target_angle
             errors.append((target_angle, error))
-            
+
             logger.info(f"Угол: {target_angle}°, Ошибка: {error:.3f}°")
-        
+
         return errors
 
+    def calibrate_axis(self, axis: str, points: int = None) -> CompensationTable:
+        """Плотный прогон оси и построение таблицы коррекции"""
+        table = Calibrator(self).calibrate_axis(
+            axis, points or self.calibration_config['sweep_points'], self.calibration_config['nodes'])
+        with self.lock:
+            self.save_compensation()
+        return table
+
+    def save_compensation(self):
+        """Сохранение таблиц коррекции по пути из конфигурации калибровки"""
+        path = self.calibration_config.get('path')
+        if path:
+            save_tables(path, self.compensation)
+            logger.info(f"Таблицы коррекции сохранены: {path}")
+
     def _command_worker(self):
         while self.is_running:
             if self.command_queue:
@@ -292,8 +642,11 @@ class StepperControlSystem:
         elif cmd_type == MovementCommand.STOP:
             self.stop_movement()
         elif cmd_type == MovementCommand.HOME:
-            for axis in command['axes']:
-                self.home_axis(axis)
+            try:
+                for axis in command['axes']:
+                    self.home_axis(axis)
+            except MotionAborted as e:
+                logger.error(str(e))
 
     def add_command(self, command_type: MovementCommand, **kwargs):
         command = {'type': command_type, **kwargs}
@@ -304,4 +657,6 @@ class StepperControlSystem:
         self.stop_movement()
         if self.worker_thread.is_alive():
             self.worker_thread.join(timeout=1.0)
-        self.hw.cleanup()
\ No newline at end of file
+        self.hw.cleanup()
+        if self.journal is not None:
+            self.journal.close()
\ No newline at end of file
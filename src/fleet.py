@@ -0,0 +1,167 @@
+import os
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+from control_system import StepperControlSystem
+from hardware_interface import HardwareInterface, create_hardware
+from position_journal import PositionJournal
+from calibration import load_tables
+from kinematics import create_kinematics
+from keep_out import build_zones
+from config import build_axes_config
+
+logger = logging.getLogger("FleetController")
+
+
+def create_rig_hardware(name: str, config: Dict[str, Any], simulate: bool = False,
+                        fallback: bool = True) -> Tuple[str, HardwareInterface]:
+    """Драйвер оборудования установки: (имя драйвера, драйвер)
+
+    При ошибке инициализации реального оборудования и fallback=True
+    установка переключается на симуляцию.
+    """
+    backend = 'simulated' if simulate else config['backend']
+    try:
+        hardware = create_hardware(backend, config['pins'], config['backend_options'].get(backend))
+    except Exception as e:
+        if backend == 'simulated' or not fallback:
+            raise
+        logger.error(f"[{name}] Ошибка инициализации оборудования '{backend}': {e}")
+        logger.info(f"[{name}] Переключаемся в режим симуляции")
+        backend = 'simulated'
+        hardware = create_hardware(backend, config['pins'])
+    logger.info(f"[{name}] Драйвер оборудования: {backend}")
+    return backend, hardware
+
+
+def create_rig(name: str, config: Dict[str, Any], simulate: bool = False, fallback: bool = True,
+               hardware: HardwareInterface = None) -> StepperControlSystem:
+    """Создание системы управления одной установки по ее конфигурации (как у load_config)
+
+    Единственное место сборки системы из конфигурации: им пользуются парк,
+    веб-интерфейс и main.py. Готовый драйвер можно передать в hardware.
+    """
+    axes_config = build_axes_config(config['axes'])
+    if hardware is None:
+        _, hardware = create_rig_hardware(name, config, simulate, fallback)
+
+    journal = None
+    if config['journal'].get('enabled'):
+        journal = PositionJournal(config['journal']['path'], list(axes_config))
+
+    system = StepperControlSystem(axes_config, hardware, journal, config['jog'],
+                                  create_kinematics(config['kinematics']),
+                                  build_zones(config['keep_out']),
+                                  config['calibration'])
+    if os.path.exists(config['calibration']['path']):
+        system.compensation.update(load_tables(config['calibration']['path']))
+        logger.info(f"[{name}] Загружены таблицы коррекции: {list(system.compensation)}")
+    if not system.is_position_trusted():
+        logger.warning(f"[{name}] Положение осей недостоверно, требуется поиск нуля")
+    return system
+
+
+class FleetController:
+    """Несколько именованных установок в одном процессе.
+
+    У каждой установки свой рабочий поток: команды одной установки
+    выполняются по очереди, разные установки двигаются параллельно.
+    Синхронное перемещение проверяет цель каждой установки в ее рабочем
+    потоке, после уже поставленных команд, и запускает движения
+    одновременно (через барьер), когда проверку прошли все установки.
+    """
+
+    def __init__(self, rigs: Dict[str, StepperControlSystem], sync_timeout: float = 10.0):
+        self.rigs = dict(rigs)
+        self.sync_timeout = sync_timeout
+        self.workers = {name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"rig-{name}")
+                        for name in self.rigs}
+
+    @classmethod
+    def from_config(cls, fleet_config: Dict[str, Any], simulate: bool = False) -> 'FleetController':
+        """Создание парка по результату config.load_fleet_config"""
+        rigs = {}
+        try:
+            for name, config in fleet_config['rigs'].items():
+                rigs[name] = create_rig(name, config, simulate)
+        except Exception:
+            for system in rigs.values():
+                system.shutdown()
+            raise
+        return cls(rigs, fleet_config['sync_timeout'])
+
+    def get(self, rig: str) -> StepperControlSystem:
+        if rig not in self.rigs:
+            raise KeyError(f"Установка {rig} не найдена")
+        return self.rigs[rig]
+
+    def submit(self, rig: str, command: Callable, *args, **kwargs) -> Future:
+        """Выполнение command(system, *args) в рабочем потоке установки"""
+        system = self.get(rig)
+        return self.workers[rig].submit(command, system, *args, **kwargs)
+
+    def warm_up(self):
+        """Прогрев всех установок параллельно"""
+        futures = [self.submit(rig, StepperControlSystem.warm_up) for rig in self.rigs]
+        for future in futures:
+            future.result()
+
+    @property
+    def is_ready(self) -> bool:
+        return all(system.is_ready for system in self.rigs.values())
+
+    def status(self) -> Dict[str, Dict]:
+        return {rig: system.get_status() for rig, system in self.rigs.items()}
+
+    def move(self, rig: str, coordinates: Dict[str, float], speed: float = None) -> bool:
+        return self.submit(rig, StepperControlSystem.move_to_coordinates, coordinates, speed).result()
+
+    def move_all(self, targets: Dict[str, Dict[str, float]], speed: float = None) -> Dict[str, bool]:
+        """Синхронное перемещение нескольких установок: все или ни одной
+
+        Недопустимая цель хотя бы одной установки отменяет команду целиком
+        (ValueError) до начала движения. Цель проверяется в рабочем потоке
+        установки от положения, в котором ее оставят ранее поставленные
+        команды, а не от текущего.
+        """
+        for rig in targets:
+            self.get(rig)
+        if not targets:
+            return {}
+
+        barrier = threading.Barrier(len(targets), timeout=self.sync_timeout)
+        rejected = []
+
+        def synchronized_move(system, rig, coordinates):
+            if not system.can_move_to(coordinates):
+                rejected.append(rig)
+                barrier.abort()
+                return False
+            barrier.wait()
+            return system.move_to_coordinates(coordinates, speed)
+
+        futures = {rig: self.submit(rig, synchronized_move, rig, coordinates)
+                   for rig, coordinates in targets.items()}
+        results = {}
+        for rig, future in futures.items():
+            try:
+                results[rig] = future.result()
+            except threading.BrokenBarrierError:
+                if not rejected:
+                    logger.error(f"[{rig}] Синхронный старт не состоялся: установки заняты")
+                results[rig] = False
+        if rejected:
+            raise ValueError(f"Недопустимые цели для установок: {sorted(rejected)}")
+        return results
+
+    def stop_all(self):
+        """Остановка всех установок одновременно, минуя очереди команд"""
+        with ThreadPoolExecutor(max_workers=max(len(self.rigs), 1), thread_name_prefix='fleet-stop') as pool:
+            list(pool.map(StepperControlSystem.stop_movement, self.rigs.values()))
+
+    def shutdown(self):
+        for worker in self.workers.values():
+            worker.shutdown(wait=True)
+        for system in self.rigs.values():
+            system.shutdown()
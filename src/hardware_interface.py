@@ -1,4 +1,31 @@
+import importlib
+import threading
+import time
 from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+# Реестр драйверов: имя -> "модуль:класс". Модуль импортируется только при
+# выборе драйвера, поэтому RPi.GPIO не нужен на машинах без Raspberry Pi.
+BACKENDS = {
+    'rpi': 'raspberry_pi_hw:RaspberryPiHardware',
+    'simulated': 'simulated_hw:SimulatedHardware',
+    'pigpio_wave': 'pigpio_wave_hw:PigpioWaveHardware',
+}
+
+
+def create_hardware(backend: str, pin_config: dict, options: dict = None) -> 'HardwareInterface':
+    """Создание драйвера по имени из реестра BACKENDS"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный драйвер оборудования: {backend}")
+    module_name, class_name = BACKENDS[backend].split(':')
+    hardware_class = getattr(importlib.import_module(module_name), class_name)
+    return hardware_class(pin_config, **(options or {}))
+
+
+class MotionAborted(RuntimeError):
+    """Движение прервано аварийной остановкой, положение осей неизвестно"""
+    pass
+
 
 class HardwareInterface(ABC):
     @abstractmethod
@@ -19,4 +46,36 @@ class HardwareInterface(ABC):
     
     @abstractmethod
     def cleanup(self):
-        pass
\ No newline at end of file
+        pass
+
+    def read_position(self, axis: str) -> Optional[float]:
+        """Угол оси по внешнему датчику (энкодеру), None если датчика нет"""
+        return None
+
+    def warm_up(self):
+        """Предварительные вычисления до первого движения"""
+        pass
+
+    def set_position(self, axis: str, steps: int):
+        """Положение оси в шагах, заданное системой (журнал, поиск нуля).
+        Драйверы, коммутирующие обмотки сами, выставляют по нему фазу."""
+        pass
+
+    def move_axes(self, moves: Dict[str, int]):
+        """Перемещение нескольких осей; по умолчанию оси двигаются по очереди"""
+        for axis, steps in moves.items():
+            self.move_axis(axis, steps)
+
+    def run_schedule(self, schedule: List[Dict[str, int]], interval: float,
+                     stop: Optional[threading.Event] = None):
+        """Исполнение спланированного движения: шаги осей по точкам траектории,
+        не короче interval секунд на точку. Установленный stop прерывает
+        движение между точками (MotionAborted)."""
+        for moves in schedule:
+            if stop is not None and stop.is_set():
+                raise MotionAborted("Движение прервано аварийной остановкой")
+            self.move_axes(moves)
+            if stop is not None:
+                stop.wait(interval)
+            else:
+                time.sleep(interval)
\ No newline at end of file
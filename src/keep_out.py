@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class KeepOutZone:
+    """Запретная область: прямоугольный параллелепипед в пространстве углов.
+
+    bounds задает диапазон [min, max] только для ограниченных осей;
+    по остальным осям зона занимает весь ход.
+    """
+    name: str
+    bounds: Dict[str, Tuple[float, float]]
+
+
+def build_zones(zones_data: List[Dict]) -> List[KeepOutZone]:
+    """Преобразование списка зон из конфигурации в объекты KeepOutZone"""
+    return [KeepOutZone(name=zone['name'],
+                        bounds={axis: (float(lo), float(hi)) for axis, (lo, hi) in zone['bounds'].items()})
+            for zone in zones_data]
+
+
+class KeepOutIndex:
+    """Индекс запретных зон для проверки траекторий по отрезкам.
+
+    По каждой оси ход делится на равные ячейки, в ячейке хранится битовая
+    маска зон, которые ее перекрывают. Кандидаты для отрезка - пересечение
+    (AND) масок по всем осям, точная проверка отрезка с параллелепипедом
+    (метод Лианга-Барски) выполняется только для кандидатов.
+    """
+
+    def __init__(self, zones: List[KeepOutZone], axis_names: List[str],
+                 min_angles: Sequence[float], max_angles: Sequence[float], cells: int = 64):
+        self.zones = zones
+        self.cells = cells
+        self.axis_count = len(axis_names)
+        self.origin = list(min_angles)
+        self.inv_cell = [cells / (hi - lo) if hi > lo else 0.0
+                         for lo, hi in zip(min_angles, max_angles)]
+
+        # Границы зон по номерам осей; ось без ограничения - вся прямая
+        self.lower = [[float('-inf')] * self.axis_count for _ in zones]
+        self.upper = [[float('inf')] * self.axis_count for _ in zones]
+        index = {name: i for i, name in enumerate(axis_names)}
+        for z, zone in enumerate(zones):
+            for axis, (lo, hi) in zone.bounds.items():
+                if axis not in index:
+                    raise ValueError(f"Зона {zone.name}: ось {axis} не найдена")
+                if lo > hi:
+                    raise ValueError(f"Зона {zone.name}: пустой диапазон по оси {axis}")
+                self.lower[z][index[axis]] = lo
+                self.upper[z][index[axis]] = hi
+
+        self.masks = [[0] * cells for _ in range(self.axis_count)]
+        for a in range(self.axis_count):
+            axis_masks = self.masks[a]
+            for z in range(len(zones)):
+                first = self._cell(a, self.lower[z][a])
+                last = self._cell(a, self.upper[z][a])
+                bit = 1 << z
+                for c in range(first, last + 1):
+                    axis_masks[c] |= bit
+
+    def _cell(self, axis: int, value: float) -> int:
+        u = (value - self.origin[axis]) * self.inv_cell[axis]
+        if u <= 0.0:
+            return 0
+        if u >= self.cells:
+            return self.cells - 1
+        return int(u)
+
+    def _span_mask(self, axis: int, first: int, last: int) -> int:
+        axis_masks = self.masks[axis]
+        if first > last:
+            first, last = last, first
+        mask = 0
+        for c in range(first, last + 1):
+            mask |= axis_masks[c]
+        return mask
+
+    def _segment_hits(self, z: int, p0: Sequence[float], p1: Sequence[float]) -> bool:
+        t0, t1 = 0.0, 1.0
+        lower, upper = self.lower[z], self.upper[z]
+        for a in range(self.axis_count):
+            start, delta = p0[a], p1[a] - p0[a]
+            if delta == 0.0:
+                if start < lower[a] or start > upper[a]:
+                    return False
+                continue
+            ta = (lower[a] - start) / delta
+            tb = (upper[a] - start) / delta
+            if ta > tb:
+                ta, tb = tb, ta
+            t0, t1 = max(t0, ta), min(t1, tb)
+            if t0 > t1:
+                return False
+        return True
+
+    def find_collision(self, columns: Sequence[Sequence[float]]) -> Optional[Tuple[int, str]]:
+        """Первый отрезок ломаной, задевающий зону: (номер отрезка, имя зоны) или None.
+
+        columns[a] - значения оси a во всех точках ломаной (по столбцам).
+        """
+        if not self.zones or not columns or not columns[0]:
+            return None
+
+        # Ячейки всех точек по всем осям за один проход
+        cells = [[self._cell(a, v) for v in column] for a, column in enumerate(columns)]
+
+        # Быстрый отсев по габариту всей ломаной
+        candidates = -1
+        for a, axis_cells in enumerate(cells):
+            candidates &= self._span_mask(a, min(axis_cells), max(axis_cells))
+            if not candidates:
+                return None
+
+        points = list(zip(*columns))
+        if len(points) == 1:
+            points.append(points[0])
+            cells = [axis_cells * 2 for axis_cells in cells]
+
+        for k in range(len(points) - 1):
+            mask = candidates
+            for a, axis_cells in enumerate(cells):
+                mask &= self._span_mask(a, axis_cells[k], axis_cells[k + 1])
+                if not mask:
+                    break
+            z = 0
+            while mask:
+                if mask & 1 and self._segment_hits(z, points[k], points[k + 1]):
+                    return k, self.zones[z].name
+                mask >>= 1
+                z += 1
+        return None
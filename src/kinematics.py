@@ -0,0 +1,111 @@
+import math
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence, Tuple
+
+Columns = Dict[str, List[float]]
+Points = Tuple[List[float], List[float], List[float]]
+
+
+class KinematicsModel(ABC):
+    """Преобразование между углами осей и координатами цели.
+
+    Все методы работают с пакетами точек, разложенными по столбцам
+    (по списку значений на каждую координату), чтобы траектория или
+    поток целей пересчитывались за один вызов.
+    """
+
+    @abstractmethod
+    def forward(self, angles: Columns) -> Points:
+        """Углы осей -> декартовы координаты (x, y, z)"""
+        pass
+
+    @abstractmethod
+    def inverse(self, x: Sequence[float], y: Sequence[float], z: Sequence[float]) -> Columns:
+        """Декартовы координаты -> углы осей"""
+        pass
+
+    @abstractmethod
+    def from_azel(self, azimuth: Sequence[float], elevation: Sequence[float]) -> Columns:
+        """Азимут/угол места -> углы осей"""
+        pass
+
+    def periodic_axes(self) -> List[str]:
+        """Оси, углы которых заданы с точностью до 360° (азимут)"""
+        return []
+
+    def to_axis_angles(self, columns: Dict[str, Sequence[float]]) -> Columns:
+        """Определение формата координат по ключам и пересчет в углы осей"""
+        if {'x', 'y', 'z'} <= columns.keys():
+            return self.inverse(columns['x'], columns['y'], columns['z'])
+        if {'azimuth', 'elevation'} <= columns.keys():
+            return self.from_azel(columns['azimuth'], columns['elevation'])
+        return {axis: list(values) for axis, values in columns.items()}
+
+
+class IdentityKinematics(KinematicsModel):
+    """Координаты задаются непосредственно углами осей"""
+
+    def forward(self, angles: Columns) -> Points:
+        raise ValueError("Модель identity не задает декартовых координат")
+
+    def inverse(self, x, y, z) -> Columns:
+        raise ValueError("Модель identity не задает декартовых координат")
+
+    def from_azel(self, azimuth, elevation) -> Columns:
+        raise ValueError("Модель identity не задает азимут/угол места")
+
+
+class PanTiltKinematics(KinematicsModel):
+    """Поворотная платформа: горизонтальная ось - азимут, вертикальная - угол места"""
+
+    def __init__(self, pan_axis: str = 'horizontal', tilt_axis: str = 'vertical',
+                 pan_offset: float = 0.0, tilt_offset: float = 0.0):
+        self.pan_axis = pan_axis
+        self.tilt_axis = tilt_axis
+        self.pan_offset = pan_offset
+        self.tilt_offset = tilt_offset
+
+    def periodic_axes(self) -> List[str]:
+        return [self.pan_axis]
+
+    def forward(self, angles: Columns) -> Points:
+        rad = math.radians
+        cos, sin = math.cos, math.sin
+        x, y, z = [], [], []
+        for pan, tilt in zip(angles[self.pan_axis], angles[self.tilt_axis]):
+            az = rad(pan + self.pan_offset)
+            el = rad(tilt + self.tilt_offset)
+            cos_el = cos(el)
+            x.append(cos_el * cos(az))
+            y.append(cos_el * sin(az))
+            z.append(sin(el))
+        return x, y, z
+
+    def inverse(self, x, y, z) -> Columns:
+        deg = math.degrees
+        atan2, hypot = math.atan2, math.hypot
+        azimuth = [deg(atan2(yi, xi)) for xi, yi in zip(x, y)]
+        elevation = [deg(atan2(zi, hypot(xi, yi))) for xi, yi, zi in zip(x, y, z)]
+        return self.from_azel(azimuth, elevation)
+
+    def from_azel(self, azimuth, elevation) -> Columns:
+        pan_offset, tilt_offset = self.pan_offset, self.tilt_offset
+        return {
+            self.pan_axis: [(az - pan_offset) % 360.0 for az in azimuth],
+            self.tilt_axis: [el - tilt_offset for el in elevation],
+        }
+
+
+# Реестр моделей кинематики: имя из KINEMATICS_CONFIG['model'] -> класс
+KINEMATICS_MODELS = {
+    'identity': IdentityKinematics,
+    'pan_tilt': PanTiltKinematics,
+}
+
+
+def create_kinematics(config: Dict) -> KinematicsModel:
+    params = dict(config)
+    model = params.pop('model', 'identity')
+    if model not in KINEMATICS_MODELS:
+        raise ValueError(f"Неизвестная модель кинематики: {model}")
+    return KINEMATICS_MODELS[model](**params)
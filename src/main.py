@@ -1,9 +1,7 @@
 import argparse
 import logging
-from control_system import StepperControlSystem, AxisConfig
-from raspberry_pi_hw import RaspberryPiHardware
-from simulated_hw import SimulatedHardware
-from config import DEFAULT_AXES_CONFIG, DEFAULT_PIN_CONFIG, LOG_CONFIG
+from config import LOG_CONFIG, load_config
+from fleet import create_rig
 
 def setup_logging():
     logging.basicConfig(
@@ -22,27 +20,12 @@ def main():
     logger = logging.getLogger("Main")
     
     try:
-        # Конвертируем словарь конфигурации в объекты AxisConfig
-        axes_config = {}
-        for axis_name, axis_data in DEFAULT_AXES_CONFIG.items():
-            axes_config[axis_name] = AxisConfig(
-                name=axis_name,
-                steps_per_degree=axis_data['steps_per_degree'],
-                max_angle=axis_data['max_angle'],
-                min_angle=axis_data['min_angle'],
-                homing_pin=axis_data['homing_pin'],
-                max_speed=axis_data.get('max_speed', 10.0),
-                holding_torque=axis_data.get('holding_torque', True)
-            )
-
+        config = load_config(args.config)
         if args.simulate:
-            hardware = SimulatedHardware(DEFAULT_PIN_CONFIG)
             logger.info("Запуск в режиме симуляции")
-        else:
-            hardware = RaspberryPiHardware(DEFAULT_PIN_CONFIG)
-            logger.info("Запуск с реальным оборудованием")
-        
-        control_system = StepperControlSystem(DEFAULT_AXES_CONFIG, hardware)
+        # Без --simulate ошибка оборудования завершает программу, а не включает симуляцию
+        control_system = create_rig('main', config, args.simulate, fallback=False)
+        control_system.warm_up()
         logger.info("Система управления инициализирована")
         
         # Пример работы системы
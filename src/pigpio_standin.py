@@ -0,0 +1,249 @@
+"""Локальная замена pigpiod для проверки драйвера PigpioWaveHardware без Raspberry Pi.
+
+Принимает тот же сокетный протокол (команды GPIO и волн), проигрывает
+волны по часам процесса и проверяет временные характеристики потока:
+разрывы между волнами, которые клиент ставил встык (недогрузка буфера),
+и импульсы короче допустимого. Запуск:
+
+    python src/pigpio_standin.py --port 8888 --min-pulse-us 100
+"""
+import argparse
+import logging
+import socketserver
+import threading
+import time
+from typing import Dict, List
+from pigpio_wave_hw import (
+    COMMAND, RESPONSE, PULSE, Pulse,
+    PI_CMD_MODES, PI_CMD_READ, PI_CMD_WRITE, PI_CMD_WVCLR, PI_CMD_WVAG,
+    PI_CMD_WVBSY, PI_CMD_WVHLT, PI_CMD_WVCRE, PI_CMD_WVDEL, PI_CMD_WVNEW,
+    PI_CMD_WVTAT, PI_CMD_WVTXM, PI_WAVE_MODE_ONE_SHOT_SYNC, PI_NO_TX_WAVE
+)
+
+logger = logging.getLogger("PigpioStandIn")
+
+# Коды ошибок pigpio
+PI_BAD_WAVE_ID = -66
+PI_EMPTY_WAVEFORM = -69
+PI_CMD_UNKNOWN = -88
+
+
+class _QueuedWave:
+    def __init__(self, wave_id: int, start_us: int, pulses: List[Pulse]):
+        self.wave_id = wave_id
+        self.start_us = start_us
+        self.pulses = pulses
+        self.applied = 0
+        self.next_at = start_us
+        self.end_us = start_us + sum(pulse[2] for pulse in pulses)
+
+
+class StandInState:
+    """Состояние виртуального pigpiod: уровни пинов, волны и очередь передачи"""
+
+    def __init__(self, min_pulse_us: int = 0):
+        self.min_pulse_us = min_pulse_us
+        self.lock = threading.Lock()
+        self.epoch = time.monotonic()
+
+        self.modes: Dict[int, int] = {}
+        self.levels: Dict[int, int] = {}
+        self.building: List[Pulse] = []
+        self.waves: Dict[int, List[Pulse]] = {}
+        self.queue: List[_QueuedWave] = []
+        self.last_end_us = None
+
+        self.stats = {
+            'waves_sent': 0,
+            'pulses_sent': 0,
+            'underruns': 0,
+            'max_gap_us': 0,
+            'short_pulses': 0,
+            'transitions': {},
+        }
+
+    def now_us(self) -> int:
+        return int((time.monotonic() - self.epoch) * 1e6)
+
+    def _apply(self, pulse: Pulse):
+        on_mask, off_mask, _ = pulse
+        for mask, level in ((on_mask, 1), (off_mask, 0)):
+            pin = 0
+            while mask:
+                if mask & 1 and self.levels.get(pin, 0) != level:
+                    self.levels[pin] = level
+                    transitions = self.stats['transitions']
+                    transitions[pin] = transitions.get(pin, 0) + 1
+                mask >>= 1
+                pin += 1
+
+    def _advance(self, now: int):
+        """Применение импульсов, момент которых уже наступил"""
+        while self.queue:
+            wave = self.queue[0]
+            while wave.applied < len(wave.pulses) and wave.next_at <= now:
+                pulse = wave.pulses[wave.applied]
+                self._apply(pulse)
+                wave.next_at += pulse[2]
+                wave.applied += 1
+            if wave.end_us > now:
+                return
+            self.queue.pop(0)
+
+    def _transmit(self, wave_id: int, mode: int) -> int:
+        if wave_id not in self.waves:
+            return PI_BAD_WAVE_ID
+        now = self.now_us()
+        self._advance(now)
+
+        if mode == PI_WAVE_MODE_ONE_SHOT_SYNC:
+            if self.queue:
+                start = self.queue[-1].end_us
+            else:
+                start = now
+                if self.last_end_us is not None:
+                    # Клиент хотел продолжить поток встык, но опоздал
+                    gap = now - self.last_end_us
+                    self.stats['underruns'] += 1
+                    self.stats['max_gap_us'] = max(self.stats['max_gap_us'], gap)
+                    logger.warning(f"Недогрузка буфера волн: разрыв {gap} мкс")
+        else:
+            # Обычная передача прерывает текущую волну
+            self.queue.clear()
+            start = now
+
+        wave = _QueuedWave(wave_id, start, self.waves[wave_id])
+        self.queue.append(wave)
+        self.last_end_us = wave.end_us
+        self.stats['waves_sent'] += 1
+        self.stats['pulses_sent'] += len(wave.pulses)
+        return 0
+
+    def handle(self, cmd: int, p1: int, p2: int, extension: bytes) -> int:
+        with self.lock:
+            if cmd == PI_CMD_MODES:
+                self.modes[p1] = p2
+                return 0
+            if cmd == PI_CMD_READ:
+                self._advance(self.now_us())
+                return self.levels.get(p1, 0)
+            if cmd == PI_CMD_WRITE:
+                self._advance(self.now_us())
+                self.levels[p1] = 1 if p2 else 0
+                return 0
+            if cmd == PI_CMD_WVCLR:
+                self.building, self.waves, self.queue = [], {}, []
+                self.last_end_us = None
+                return 0
+            if cmd == PI_CMD_WVNEW:
+                self.building = []
+                return 0
+            if cmd == PI_CMD_WVAG:
+                pulses = [PULSE.unpack_from(extension, offset)
+                          for offset in range(0, len(extension), PULSE.size)]
+                self.stats['short_pulses'] += sum(
+                    1 for pulse in pulses if (pulse[0] or pulse[1]) and pulse[2] < self.min_pulse_us)
+                self.building.extend(pulses)
+                return len(self.building)
+            if cmd == PI_CMD_WVCRE:
+                if not self.building:
+                    return PI_EMPTY_WAVEFORM
+                wave_id = next(i for i in range(len(self.waves) + 1) if i not in self.waves)
+                self.waves[wave_id], self.building = self.building, []
+                return wave_id
+            if cmd == PI_CMD_WVDEL:
+                if self.waves.pop(p1, None) is None:
+                    return PI_BAD_WAVE_ID
+                return 0
+            if cmd == PI_CMD_WVTXM:
+                return self._transmit(p1, p2)
+            if cmd == PI_CMD_WVTAT:
+                self._advance(self.now_us())
+                return self.queue[0].wave_id if self.queue else PI_NO_TX_WAVE
+            if cmd == PI_CMD_WVBSY:
+                self._advance(self.now_us())
+                return 1 if self.queue else 0
+            if cmd == PI_CMD_WVHLT:
+                self._advance(self.now_us())
+                self.queue.clear()
+                self.last_end_us = None
+                return 0
+            logger.error(f"Неизвестная команда pigpio: {cmd}")
+            return PI_CMD_UNKNOWN
+
+
+class _CommandHandler(socketserver.BaseRequestHandler):
+    def _read(self, size: int) -> bytes:
+        data = b''
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                return b''
+            data += chunk
+        return data
+
+    def handle(self):
+        state = self.server.state
+        while True:
+            header = self._read(COMMAND.size)
+            if not header:
+                return
+            cmd, p1, p2, p3 = COMMAND.unpack(header)
+            extension = self._read(p3) if p3 else b''
+            result = state.handle(cmd, p1, p2, extension)
+            self.request.sendall(RESPONSE.pack(cmd, p1, p2, result))
+
+
+class PigpioStandIn(socketserver.ThreadingTCPServer):
+    """TCP-сервер с протоколом pigpiod; port=0 - выбрать свободный порт"""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host: str = 'localhost', port: int = 8888, min_pulse_us: int = 0):
+        super().__init__((host, port), _CommandHandler)
+        self.state = StandInState(min_pulse_us)
+        self.thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    @property
+    def stats(self) -> Dict:
+        with self.state.lock:
+            self.state._advance(self.state.now_us())
+            stats = dict(self.state.stats)
+            stats['transitions'] = dict(stats['transitions'])
+            return stats
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Локальная замена pigpiod для проверки волн')
+    parser.add_argument('--host', type=str, default='localhost', help='Адрес прослушивания')
+    parser.add_argument('--port', type=int, default=8888, help='Порт (как у pigpiod)')
+    parser.add_argument('--min-pulse-us', type=int, default=0, help='Минимальная длительность импульса, мкс')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = PigpioStandIn(args.host, args.port, args.min_pulse_us)
+    logger.info(f"Замена pigpiod слушает {args.host}:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info(f"Статистика передачи: {server.stats}")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
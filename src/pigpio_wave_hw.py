@@ -0,0 +1,231 @@
+import socket
+import struct
+import threading
+import time
+import logging
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from hardware_interface import HardwareInterface, MotionAborted
+from raspberry_pi_hw import FULL_STEP_SEQUENCE
+
+logger = logging.getLogger("PigpioWaveHardware")
+
+# Сокетный протокол pigpiod: команда - четыре uint32 (cmd, p1, p2, p3),
+# p3 - длина дополнительных данных, которые идут следом. Ответ - те же
+# 16 байт, где в последнем поле стоит результат (int32, <0 - ошибка).
+COMMAND = struct.Struct('<IIII')
+RESPONSE = struct.Struct('<IIIi')
+PULSE = struct.Struct('<III')   # gpioOn (маска), gpioOff (маска), usDelay
+
+PI_CMD_MODES = 0
+PI_CMD_READ = 3
+PI_CMD_WRITE = 4
+PI_CMD_WVCLR = 27
+PI_CMD_WVAG = 28
+PI_CMD_WVBSY = 32
+PI_CMD_WVHLT = 33
+PI_CMD_WVCRE = 49
+PI_CMD_WVDEL = 50
+PI_CMD_WVNEW = 53
+PI_CMD_WVTAT = 99
+PI_CMD_WVTXM = 100
+
+PI_INPUT = 0
+PI_OUTPUT = 1
+PI_WAVE_MODE_ONE_SHOT = 0
+PI_WAVE_MODE_ONE_SHOT_SYNC = 2
+PI_NO_TX_WAVE = 9999
+
+Pulse = Tuple[int, int, int]
+
+
+class PigpioError(RuntimeError):
+    pass
+
+
+def compile_waveform(schedule: List[Dict[str, int]], interval: float, step_rate: float,
+                     phase_masks: Dict[str, List[Tuple[int, int]]],
+                     phase_index: Dict[str, int]) -> List[Pulse]:
+    """Компиляция плана движения в импульсы pigpio.
+
+    Каждая точка плана длится не меньше interval и не меньше, чем нужно
+    самой нагруженной оси при step_rate шагов/с; шаги каждой оси
+    равномерно распределяются внутри точки. События разных осей в один
+    момент объединяются в один импульс. phase_index обновляется до фазы,
+    в которой окажутся оси после исполнения.
+    """
+    events = {}
+    segment_start = 0
+    for moves in schedule:
+        busiest = max((abs(steps) for steps in moves.values()), default=0)
+        duration = max(int(interval * 1e6), int(busiest * 1e6 / step_rate))
+        for axis, steps in moves.items():
+            count = abs(steps)
+            direction = 1 if steps > 0 else -1
+            masks = phase_masks[axis]
+            index = phase_index[axis]
+            for k in range(count):
+                index = (index + direction) % len(masks)
+                at = segment_start + (k * duration) // count
+                on_mask, off_mask = masks[index]
+                event = events.setdefault(at, [0, 0])
+                event[0] |= on_mask
+                event[1] |= off_mask
+            phase_index[axis] = index
+        segment_start += duration
+
+    pulses = []
+    times = sorted(events)
+    for k, at in enumerate(times):
+        end = times[k + 1] if k + 1 < len(times) else segment_start
+        on_mask, off_mask = events[at]
+        pulses.append((on_mask, off_mask, max(end - at, 1)))
+    if times and times[0] > 0:
+        pulses.insert(0, (0, 0, times[0]))
+    return pulses
+
+
+class PigpioWaveHardware(HardwareInterface):
+    """Драйвер с аппаратной синхронизацией шагов через волны (DMA) pigpiod.
+
+    План движения компилируется в импульсы и отправляется кусками по
+    chunk_pulses. В демоне одновременно находятся не больше двух волн:
+    пока передается одна, Python готовит и ставит в очередь следующую
+    (режим ONE_SHOT_SYNC), поэтому дрожание планировщика ОС влияет
+    только на запас буфера, а не на моменты шагов.
+    """
+
+    def __init__(self, pin_config: dict, host: str = 'localhost', port: int = 8888,
+                 step_rate: float = 500.0, chunk_pulses: int = 500,
+                 poll_interval: float = 0.001, timeout: float = 5.0):
+        self.pin_config = pin_config
+        self.step_rate = step_rate
+        self.chunk_pulses = chunk_pulses
+        self.poll_interval = poll_interval
+        self.endstop_pins = set(pin_config.get('endstops', []))
+        self.motor_axes = [axis for axis in pin_config if axis != 'endstops']
+        self.phase_index = {axis: 0 for axis in self.motor_axes}
+        self.phase_masks = {}
+        self.halted = False
+        self.io_lock = threading.RLock()
+
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        logger.info(f"Подключение к pigpiod {host}:{port}, {step_rate} шагов/с")
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        for pin in self.endstop_pins:
+            self._command(PI_CMD_MODES, pin, PI_INPUT)
+        for axis in self.motor_axes:
+            for pin in pin_config[axis]:
+                self._command(PI_CMD_MODES, pin, PI_OUTPUT)
+        self._command(PI_CMD_WVCLR)
+        self.warm_up()
+
+    def _command(self, cmd: int, p1: int = 0, p2: int = 0, extension: bytes = b'') -> int:
+        with self.io_lock:
+            self.sock.sendall(COMMAND.pack(cmd, p1, p2, len(extension)) + extension)
+            response = b''
+            while len(response) < RESPONSE.size:
+                chunk = self.sock.recv(RESPONSE.size - len(response))
+                if not chunk:
+                    raise PigpioError("Соединение с pigpiod разорвано")
+                response += chunk
+        result = RESPONSE.unpack(response)[3]
+        if result < 0:
+            raise PigpioError(f"pigpiod: команда {cmd} вернула ошибку {result}")
+        return result
+
+    def warm_up(self):
+        """Предрасчет масок включения/выключения пинов для каждой фазы"""
+        for axis in self.motor_axes:
+            pins = self.pin_config[axis]
+            self.phase_masks[axis] = [
+                (sum(1 << pin for pin, level in zip(pins, phase) if level),
+                 sum(1 << pin for pin, level in zip(pins, phase) if not level))
+                for phase in FULL_STEP_SEQUENCE
+            ]
+
+    def _create_wave(self, pulses: List[Pulse]) -> int:
+        self._command(PI_CMD_WVNEW)
+        self._command(PI_CMD_WVAG, extension=b''.join(PULSE.pack(*pulse) for pulse in pulses))
+        return self._command(PI_CMD_WVCRE)
+
+    def _wave_tx_at(self) -> int:
+        return self._command(PI_CMD_WVTAT)
+
+    def _aborted(self, stop: Optional[threading.Event]) -> bool:
+        return self.halted or (stop is not None and stop.is_set())
+
+    def _transmit(self, pulses: List[Pulse], stop: Optional[threading.Event] = None):
+        """Передача импульсов кусками с двойной буферизацией"""
+        in_flight = deque()
+        for start in range(0, len(pulses), self.chunk_pulses):
+            if self._aborted(stop):
+                break
+            wave_id = self._create_wave(pulses[start:start + self.chunk_pulses])
+            mode = PI_WAVE_MODE_ONE_SHOT_SYNC if in_flight else PI_WAVE_MODE_ONE_SHOT
+            self._command(PI_CMD_WVTXM, wave_id, mode)
+            in_flight.append(wave_id)
+
+            # Третью волну готовим только после того, как первая отработала
+            while len(in_flight) > 1 and not self._aborted(stop):
+                if self._wave_tx_at() != in_flight[0]:
+                    self._command(PI_CMD_WVDEL, in_flight.popleft())
+                else:
+                    time.sleep(self.poll_interval)
+
+        while not self._aborted(stop) and self._command(PI_CMD_WVBSY):
+            time.sleep(self.poll_interval)
+        if self._aborted(stop):
+            # Волна могла уйти в демон уже после WVHLT из emergency_stop
+            self._command(PI_CMD_WVHLT)
+        while in_flight:
+            self._command(PI_CMD_WVDEL, in_flight.popleft())
+        if self._aborted(stop):
+            raise MotionAborted("Движение прервано аварийной остановкой")
+
+    def run_schedule(self, schedule: List[Dict[str, int]], interval: float,
+                     stop: Optional[threading.Event] = None):
+        self.halted = False
+        pulses = compile_waveform(schedule, interval, self.step_rate,
+                                  self.phase_masks, self.phase_index)
+        if pulses:
+            self._transmit(pulses, stop)
+
+    def set_position(self, axis: str, steps: int):
+        if axis in self.phase_index:
+            self.phase_index[axis] = steps % len(FULL_STEP_SEQUENCE)
+
+    def move_axes(self, moves: Dict[str, int]):
+        self.run_schedule([moves], 0.0)
+
+    def move_axis(self, axis: str, steps: int):
+        if axis not in self.phase_index:
+            raise ValueError(f"Ось {axis} не найдена в конфигурации")
+        self.move_axes({axis: steps})
+
+    def set_holding_torque(self, axis: str, enable: bool):
+        if axis not in self.phase_index:
+            return
+        on_mask = self.phase_masks[axis][self.phase_index[axis]][0] if enable else 0
+        for pin in self.pin_config[axis]:
+            self._command(PI_CMD_WRITE, pin, 1 if on_mask & (1 << pin) else 0)
+
+    def read_endstop(self, pin: int) -> bool:
+        return self._command(PI_CMD_READ, pin) == 1
+
+    def emergency_stop(self):
+        self.halted = True
+        self._command(PI_CMD_WVHLT)
+        for axis in self.motor_axes:
+            for pin in self.pin_config[axis]:
+                self._command(PI_CMD_WRITE, pin, 0)
+
+    def cleanup(self):
+        if self.sock is None:
+            return
+        try:
+            self._command(PI_CMD_WVCLR)
+        finally:
+            self.sock.close()
+            self.sock = None
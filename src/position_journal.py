@@ -0,0 +1,103 @@
+import mmap
+import os
+import struct
+import zlib
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger("PositionJournal")
+
+# Журнал хранит две фиксированные записи (слота) и пишет их по очереди.
+# Оборванная запись в одном слоте не портит предыдущую во втором, а выбор
+# актуального слота делается по номеру последовательности и CRC32.
+_MAGIC = b'SPJ1'
+_HEADER = struct.Struct('<4sQIIB')   # magic, sequence, layout_hash, axis_count, in_motion
+_AXIS = struct.Struct('<dqB')        # angle, steps, trusted
+_CRC = struct.Struct('<I')
+_SLOTS = 2
+
+
+@dataclass
+class JournalRecord:
+    """Состояние осей; списки упорядочены как axis_names журнала"""
+    sequence: int
+    angles: List[float]
+    steps: List[int]
+    trusted: List[bool]
+    in_motion: bool
+
+
+class PositionJournal:
+    """Журнал положения осей с двойной буферизацией в mmap-файле"""
+
+    def __init__(self, path: str, axis_names: List[str]):
+        self.path = path
+        self.axis_names = list(axis_names)
+        self.layout_hash = zlib.crc32('\0'.join(self.axis_names).encode('utf-8'))
+        self.slot_size = _HEADER.size + _AXIS.size * len(self.axis_names) + _CRC.size
+        self.sequence = 0
+
+        file_size = self.slot_size * _SLOTS
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size != file_size:
+            # Новый файл или изменился состав осей - старые данные непригодны
+            os.ftruncate(self._fd, 0)
+            os.ftruncate(self._fd, file_size)
+            os.fsync(self._fd)
+        self._mm = mmap.mmap(self._fd, file_size)
+
+    def _read_slot(self, index: int) -> Optional[JournalRecord]:
+        offset = index * self.slot_size
+        payload_end = offset + self.slot_size - _CRC.size
+        payload = self._mm[offset:payload_end]
+        (crc,) = _CRC.unpack_from(self._mm, payload_end)
+        if zlib.crc32(payload) != crc:
+            return None
+
+        magic, sequence, layout_hash, axis_count, in_motion = _HEADER.unpack_from(payload, 0)
+        if magic != _MAGIC or layout_hash != self.layout_hash or axis_count != len(self.axis_names):
+            return None
+
+        angles, steps, trusted = [], [], []
+        for i in range(axis_count):
+            angle, axis_steps, axis_trusted = _AXIS.unpack_from(payload, _HEADER.size + i * _AXIS.size)
+            angles.append(angle)
+            steps.append(axis_steps)
+            trusted.append(bool(axis_trusted))
+
+        return JournalRecord(sequence, angles, steps, trusted, bool(in_motion))
+
+    def load(self) -> Optional[JournalRecord]:
+        """Чтение последней целостной записи журнала"""
+        records = [r for r in (self._read_slot(i) for i in range(_SLOTS)) if r is not None]
+        if not records:
+            return None
+
+        record = max(records, key=lambda r: r.sequence)
+        self.sequence = record.sequence
+        return record
+
+    def write(self, angles: Sequence[float], steps: Sequence[int],
+              trusted: Sequence[bool], in_motion: bool):
+        """Запись состояния в следующий слот с синхронизацией на диск"""
+        self.sequence += 1
+        buffer = bytearray(self.slot_size)
+        _HEADER.pack_into(buffer, 0, _MAGIC, self.sequence, self.layout_hash,
+                          len(self.axis_names), int(in_motion))
+        for i in range(len(self.axis_names)):
+            _AXIS.pack_into(buffer, _HEADER.size + i * _AXIS.size,
+                            float(angles[i]), int(steps[i]), int(trusted[i]))
+        payload_end = self.slot_size - _CRC.size
+        _CRC.pack_into(buffer, payload_end, zlib.crc32(bytes(buffer[:payload_end])))
+
+        offset = (self.sequence % _SLOTS) * self.slot_size
+        self._mm[offset:offset + self.slot_size] = buffer
+        self._mm.flush()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+            os.close(self._fd)
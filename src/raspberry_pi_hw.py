@@ -1,18 +1,51 @@
-import RPi.GPIO as GPIO
+try:
+    import RPi.GPIO as GPIO
+except ImportError:  # не Raspberry Pi - модуль можно импортировать, но не использовать
+    GPIO = None
 import time
 from hardware_interface import HardwareInterface
 
+# Полношаговая последовательность с двумя включенными обмотками
+FULL_STEP_SEQUENCE = [
+    (1, 1, 0, 0),
+    (0, 1, 1, 0),
+    (0, 0, 1, 1),
+    (1, 0, 0, 1),
+]
+
 class RaspberryPiHardware(HardwareInterface):
     def __init__(self, pin_config: dict):
+        if GPIO is None:
+            raise RuntimeError("Модуль RPi.GPIO недоступен")
+
         GPIO.setmode(GPIO.BCM)
         self.pin_config = pin_config
-        
+        self.endstop_pins = set(pin_config.get('endstops', []))
+        self.phase_index = {axis: 0 for axis in pin_config if axis != 'endstops'}
+        self.phase_table = {}
+
         all_pins = []
         for pins in pin_config.values():
             all_pins.extend(pins)
-        
+
         for pin in set(all_pins):
-            GPIO.setup(pin, GPIO.OUT if pin not in [5, 6, 13, 19] else GPIO.IN)
+            GPIO.setup(pin, GPIO.IN if pin in self.endstop_pins else GPIO.OUT)
+
+    def warm_up(self):
+        """Предрасчет уровней пинов для каждой фазы каждой оси"""
+        for axis, pins in self.pin_config.items():
+            if axis == 'endstops':
+                continue
+            self.phase_table[axis] = [
+                [(pin, GPIO.HIGH if level else GPIO.LOW) for pin, level in zip(pins, phase)]
+                for phase in FULL_STEP_SEQUENCE
+            ]
+
+    def set_position(self, axis: str, steps: int):
+        # Фаза однозначно следует из шагов: после восстановления из журнала
+        # первый шаг включает обмотки, соседние с положением ротора
+        if axis in self.phase_index:
+            self.phase_index[axis] = steps % len(FULL_STEP_SEQUENCE)
 
     def move_axis(self, axis: str, steps: int):
         if axis not in self.pin_config:
@@ -20,18 +53,23 @@ class RaspberryPiHardware(HardwareInterface):
 
         print(f"Аппаратное перемещение: ось {axis}, шагов {steps}")  # Отладочное сообщение
 
-        pins = self.pin_config[axis]
+        if axis not in self.phase_table:
+            self.warm_up()
+
+        phases = self.phase_table[axis]
         direction = 1 if steps > 0 else -1
         steps = abs(steps)
+        index = self.phase_index[axis]
+
+        print(f"Используемые пины: {self.pin_config[axis]}, направление: {direction}")  # Отладочное сообщение
 
-        print(f"Используемые пины: {pins}, направление: {direction}")  # Отладочное сообщение
-        
         for _ in range(steps):
-            for i, pin in enumerate(pins):
-                GPIO.output(pin, GPIO.HIGH if i == 0 else GPIO.LOW)
+            index = (index + direction) % len(phases)
+            for pin, level in phases[index]:
+                GPIO.output(pin, level)
             time.sleep(0.001)
-            for pin in pins:
-                GPIO.output(pin, GPIO.LOW)
+
+        self.phase_index[axis] = index
 
         print(f"Аппаратное перемещение завершено")  # Отладочное сообщение
 
@@ -43,9 +81,11 @@ class RaspberryPiHardware(HardwareInterface):
         return GPIO.input(pin) == GPIO.HIGH
 
     def emergency_stop(self):
-        for pins in self.pin_config.values():
+        for axis, pins in self.pin_config.items():
+            if axis == 'endstops':
+                continue
             for pin in pins:
                 GPIO.output(pin, GPIO.LOW)
 
     def cleanup(self):
-        GPIO.cleanup()
\ No newline at end of file
+        GPIO.cleanup()
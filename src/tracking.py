@@ -0,0 +1,158 @@
+import bisect
+import threading
+import time
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger("TargetTracker")
+
+
+class TargetTracker:
+    """Непрерывное сопровождение цели, заданной потоком точек во времени.
+
+    Точки пересчитываются в углы осей пакетами при поступлении. Рабочий
+    цикл с фиксированной частотой интерполирует траекторию и на каждом
+    такте отправляет оси в положение на конец такта (положение плюс
+    скорость цели, умноженная на такт), поэтому движение не
+    останавливается между точками.
+    """
+
+    def __init__(self, control_system, rate_hz: float = 50.0, history: float = 2.0):
+        self.system = control_system
+        self.period = 1.0 / rate_hz
+        self.history = history
+
+        # Столбцы углов по осям потока; axis_ids - номера этих осей в системе
+        self.times: List[float] = []
+        self.axis_ids: List[int] = []
+        self.columns: List[List[float]] = []
+        self.samples_lock = threading.Lock()
+
+        self.is_running = False
+        self.thread = None
+
+    def push(self, samples: List[Dict[str, float]], time_base: float = None):
+        """Добавление точек вида {'t': секунды от time_base, <координаты>...}"""
+        if not samples:
+            return
+        if time_base is None:
+            time_base = time.monotonic()
+
+        samples = sorted(samples, key=lambda sample: sample['t'])
+        columns = {key: [float(sample[key]) for sample in samples]
+                   for key in samples[0] if key != 't'}
+        angles = self.system.convert_batch(columns)
+        times = [time_base + float(sample['t']) for sample in samples]
+
+        with self.samples_lock:
+            self._unwrap(angles)
+            if not self.system.validate_batch(angles):
+                raise ValueError("Точки цели вне допустимого диапазона осей")
+            axis_ids = [self.system.axis_index[axis] for axis in angles]
+
+            # Путь проверяется от последней принятой точки (или текущего положения)
+            start = list(self.system.angles)
+            for i, column in zip(self.axis_ids, self.columns):
+                if column:
+                    start[i] = column[-1]
+            path = [[value] * (len(times) + 1) for value in start]
+            for i, values in zip(axis_ids, angles.values()):
+                path[i][1:] = values
+            if not self.system.check_path(path):
+                raise ValueError("Поток цели пересекает запретную зону")
+
+            if not self.columns:
+                self.axis_ids = axis_ids
+                self.columns = [[] for _ in axis_ids]
+            elif axis_ids != self.axis_ids:
+                raise ValueError("Набор осей в потоке цели изменился")
+
+            # Поток монотонен по времени: точки раньше уже принятых отбрасываются
+            first = bisect.bisect_right(times, self.times[-1]) if self.times else 0
+            self.times.extend(times[first:])
+            for column, values in zip(self.columns, angles.values()):
+                column.extend(values[first:])
+
+            # Старые точки больше не нужны для интерполяции
+            cutoff = bisect.bisect_left(self.times, time.monotonic() - self.history)
+            if cutoff > 1:
+                del self.times[:cutoff - 1]
+                for column in self.columns:
+                    del column[:cutoff - 1]
+
+    def _unwrap(self, angles: Dict[str, List[float]]):
+        """Непрерывность периодических осей (азимут) при переходе через 0°.
+
+        Каждый угол заменяется эквивалентом (±360°), ближайшим к предыдущей
+        точке (последней принятой или текущему положению) и лежащим в
+        пределах оси, иначе ось проворачивалась бы на полный оборот.
+        """
+        system = self.system
+        for axis in system.kinematics.periodic_axes():
+            if axis not in angles or axis not in system.axis_index:
+                continue
+            i = system.axis_index[axis]
+            lower, upper = system.min_angles[i], system.max_angles[i]
+            previous = system.angles[i]
+            if i in self.axis_ids and self.columns[self.axis_ids.index(i)]:
+                previous = self.columns[self.axis_ids.index(i)][-1]
+
+            column = angles[axis]
+            for k, value in enumerate(column):
+                base = value + 360.0 * round((previous - value) / 360.0)
+                candidates = [c for c in (base - 360.0, base, base + 360.0) if lower <= c <= upper]
+                if candidates:
+                    value = min(candidates, key=lambda c: abs(c - previous))
+                column[k] = value
+                previous = value
+
+    def sample(self, t: float):
+        """Желаемые углы и скорости осей потока (в порядке axis_ids) в момент t"""
+        with self.samples_lock:
+            times = self.times
+            if not times:
+                return None, None
+            if len(times) == 1 or t <= times[0]:
+                return [column[0] for column in self.columns], [0.0] * len(self.columns)
+            if t >= times[-1]:
+                # Новых точек нет: оси останавливаются в последней точке цели
+                return [column[-1] for column in self.columns], [0.0] * len(self.columns)
+
+            i = bisect.bisect_right(times, t)
+            t0, t1 = times[i - 1], times[i]
+            ratio = (t - t0) / (t1 - t0)
+
+            positions, velocities = [], []
+            for column in self.columns:
+                a0, a1 = column[i - 1], column[i]
+                positions.append(a0 + (a1 - a0) * ratio)
+                velocities.append((a1 - a0) / (t1 - t0))
+            return positions, velocities
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.thread = threading.Thread(target=self._loop, name='target-tracker', daemon=True)
+        self.thread.start()
+        logger.info(f"Сопровождение цели запущено, такт {self.period * 1000:.1f} мс")
+
+    def stop(self):
+        self.is_running = False
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.thread = None
+
+    def _loop(self):
+        next_tick = time.monotonic()
+        while self.is_running:
+            next_tick += self.period
+            positions, velocities = self.sample(time.monotonic())
+            if positions is not None:
+                self.system.follow_point(self.axis_ids, positions, velocities, self.period)
+
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
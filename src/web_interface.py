@@ -1,80 +1,132 @@
-from flask import Flask, render_template, request, jsonify
-from control_system import StepperControlSystem, AxisConfig
-from raspberry_pi_hw import RaspberryPiHardware
-from config import DEFAULT_AXES_CONFIG, DEFAULT_PIN_CONFIG
+import time
+_process_start = time.perf_counter()  # Отсчет холодного старта, до импорта Flask
+
+from flask import Blueprint, Flask, render_template, request, jsonify
+from control_system import StepperControlSystem
+from config import load_config, load_fleet_config
+from fleet import FleetController, create_rig, create_rig_hardware
 from flask_cors import CORS
 import argparse
 import logging
+import os
 
-app = Flask(__name__, template_folder='../templates', static_folder='../static')
-CORS(app)  # Включаем CORS для всех доменов
+# Маршруты собраны в blueprint, приложение создает create_app() после
+# инициализации системы (и при запуске скрипта, и под WSGI/flask run)
+api = Blueprint('api', __name__)
 control_system = None
+fleet = None             # FleetController в режиме нескольких установок (--fleet)
+startup_report = {}
+RIG_NAME = 'main'        # Имя единственной установки в журнале (без --fleet)
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Web интерфейс управления шаговыми двигателями')
     parser.add_argument('--simulate', action='store_true', help='Режим симуляции без реального оборудования')
+    parser.add_argument('--config', type=str, help='Файл конфигурации (.py или .json)')
+    parser.add_argument('--fleet', type=str, help='Файл конфигурации парка установок (.py или .json)')
     parser.add_argument('--port', type=int, default=5000, help='Порт для веб-сервера')
     parser.add_argument('--host', type=str, default='0.0.0.0', help='Хост для веб-сервера')
+    parser.add_argument('--debug', action='store_true', help='Отладочный режим Flask')
     return parser.parse_args()
 
 
-def init_control_system(simulate=False):
-    """Инициализация системы управления"""
-    global control_system
-
-    # Конвертируем словарь конфигурации в объекты AxisConfig
-    axes_config = {}
-    for axis_name, axis_data in DEFAULT_AXES_CONFIG.items():
-        axes_config[axis_name] = AxisConfig(
-            name=axis_name,
-            steps_per_degree=axis_data['steps_per_degree'],
-            max_angle=axis_data['max_angle'],
-            min_angle=axis_data['min_angle'],
-            homing_pin=axis_data['homing_pin'],
-            max_speed=axis_data.get('max_speed', 10.0),
-            holding_torque=axis_data.get('holding_torque', True)
-        )
-
-    # Выбираем аппаратную часть в зависимости от режима
-    if simulate:
-        from simulated_hw import SimulatedHardware
-        hardware = SimulatedHardware(DEFAULT_PIN_CONFIG)
-        logging.info("🚀 Запуск в режиме СИМУЛЯЦИИ")
-    else:
-        try:
-            hardware = RaspberryPiHardware(DEFAULT_PIN_CONFIG)
-            print("🔧 Запуск с РЕАЛЬНЫМ оборудованием")
-        except Exception as e:
-            logging.error(f"⚠️  Ошибка инициализации реального оборудования: {e}")
-            logging.info("🔄 Переключаемся в режим симуляции")
-            from simulated_hw import SimulatedHardware
-            hardware = SimulatedHardware(DEFAULT_PIN_CONFIG)
-
-    # Инициализация системы управления
-    control_system = StepperControlSystem(axes_config, hardware)
-    logging.info("✅ Система управления инициализирована")
+def init_control_system(simulate=False, config_path=None):
+    """Инициализация и прогрев системы управления с замером времени старта"""
+    global control_system, startup_report
+
+    timings = {'imports': time.perf_counter() - _process_start}
+    stage_start = time.perf_counter()
+
+    config = load_config(config_path)
+    backend, hardware = create_rig_hardware(RIG_NAME, config, simulate)
+    timings['hardware'] = time.perf_counter() - stage_start
+    stage_start = time.perf_counter()
+
+    control_system = create_rig(RIG_NAME, config, hardware=hardware)
+    timings['control_system'] = time.perf_counter() - stage_start
+    stage_start = time.perf_counter()
+
+    control_system.warm_up()
+    timings['warm_up'] = time.perf_counter() - stage_start
+    timings['total'] = time.perf_counter() - _process_start
+
+    startup_report = {
+        'backend': backend,
+        'timings_ms': {stage: round(value * 1000.0, 2) for stage, value in timings.items()}
+    }
+    logging.info(f"✅ Система управления инициализирована за {startup_report['timings_ms']['total']} мс")
     return control_system
 
 
-@app.before_request
-def before_request():
-    """Инициализация перед первым запросом"""
-    global control_system
-    if control_system is None:
-        control_system = init_control_system()
+def init_fleet(simulate=False, fleet_path=None):
+    """Инициализация и прогрев всех установок парка с замером времени старта"""
+    global fleet, startup_report
+
+    timings = {'imports': time.perf_counter() - _process_start}
+    stage_start = time.perf_counter()
+
+    fleet = FleetController.from_config(load_fleet_config(fleet_path), simulate)
+    timings['control_system'] = time.perf_counter() - stage_start
+    stage_start = time.perf_counter()
+
+    fleet.warm_up()
+    timings['warm_up'] = time.perf_counter() - stage_start
+    timings['total'] = time.perf_counter() - _process_start
+
+    startup_report = {
+        'rigs': list(fleet.rigs),
+        'timings_ms': {stage: round(value * 1000.0, 2) for stage, value in timings.items()}
+    }
+    logging.info(f"✅ Парк из {len(fleet.rigs)} установок инициализирован за {startup_report['timings_ms']['total']} мс")
+    return fleet
+
+
+def _system(rig=None):
+    """Система управления установки rig; без rig - единственная система"""
+    if rig is None:
+        return control_system
+    return fleet.rigs[rig] if fleet is not None else None
+
+
+def _run(rig, command, *args):
+    """Выполнение команды установки: в режиме парка - в рабочем потоке установки"""
+    if rig is None:
+        return command(control_system, *args)
+    return fleet.submit(rig, command, *args).result()
+
 
+def _parse_coordinates(data):
+    if 'angles' in data:
+        # Произвольный набор осей: {"angles": {"<ось>": угол, ...}}
+        return {axis: float(angle) for axis, angle in data['angles'].items()}
+    return {
+        'horizontal': float(data['h_angle']),
+        'vertical': float(data['v_angle'])
+    }
 
-@app.route('/')
+
+@api.before_request
+def check_rig():
+    """Маршруты /api/<rig>/...: неизвестная установка - 404"""
+    rig = (request.view_args or {}).get('rig')
+    if rig is not None and (fleet is None or rig not in fleet.rigs):
+        return jsonify({
+            'status': 'error',
+            'message': f'Установка {rig} не найдена'
+        }), 404
+
+
+@api.route('/')
 def index():
     return render_template('control_panel.html')
 
 
-@app.route('/api/move', methods=['POST'])
-def api_move():
+@api.route('/api/move', methods=['POST'])
+@api.route('/api/<rig>/move', methods=['POST'])
+def api_move(rig=None):
     try:
         print("Получен запрос на /api/move")  # Отладочное сообщение
         print("Заголовки:", request.headers)   # Отладочное сообщение
-        if control_system is None:
+        if _system(rig) is None:
             print("Система не инициализирована")  # Отладочное сообщение
             return jsonify({
                 'status': 'error',
@@ -83,16 +135,13 @@ def api_move():
 
         data = request.json
         print("Полученные данные:", data)  # Отладочное сообщение
-        coordinates = {
-            'horizontal': float(data['h_angle']),
-            'vertical': float(data['v_angle'])
-        }
+        coordinates = _parse_coordinates(data)
 
         print("Преобразованные координаты:", coordinates)  # Отладочное сообщение
 
         speed = float(data.get('speed', 10.0))
 
-        if control_system.move_to_coordinates(coordinates, speed):
+        if _run(rig, StepperControlSystem.move_to_coordinates, coordinates, speed):
             print("Движение успешно начато")  # Отладочное сообщение
             return jsonify({
                 'status': 'success',
@@ -115,10 +164,11 @@ def api_move():
         }), 500
 
 
-@app.route('/api/jog', methods=['POST'])
-def api_jog():
+@api.route('/api/jog', methods=['POST'])
+@api.route('/api/<rig>/jog', methods=['POST'])
+def api_jog(rig=None):
     try:
-        if control_system is None:
+        if _system(rig) is None:
             return jsonify({
                 'status': 'error',
                 'message': 'Система не инициализирована'
@@ -131,13 +181,13 @@ def api_jog():
         # Преобразуем строковое направление в числовое
         direction = 1 if direction_str == 'positive' else -1
 
-        control_system.geometric_jog(axis, direction)
+        _run(rig, StepperControlSystem.geometric_jog, axis, direction)
 
         return jsonify({
             'status': 'success',
             'axis': axis,
             'direction': direction_str,
-            'current_angle': control_system.current_angles.get(axis, 0)
+            'current_angle': _system(rig).current_angles.get(axis, 0)
         })
 
     except Exception as e:
@@ -147,10 +197,11 @@ def api_jog():
         }), 500
 
 
-@app.route('/api/home', methods=['POST'])
-def api_home():
+@api.route('/api/home', methods=['POST'])
+@api.route('/api/<rig>/home', methods=['POST'])
+def api_home(rig=None):
     try:
-        if control_system is None:
+        if _system(rig) is None:
             return jsonify({
                 'status': 'error',
                 'message': 'Система не инициализирована'
@@ -159,7 +210,7 @@ def api_home():
         data = request.json
         axis = data['axis']
 
-        control_system.home_axis(axis)
+        _run(rig, StepperControlSystem.home_axis, axis)
 
         return jsonify({
             'status': 'success',
@@ -174,16 +225,18 @@ def api_home():
         }), 500
 
 
-@app.route('/api/stop', methods=['POST'])
-def api_stop():
+@api.route('/api/stop', methods=['POST'])
+@api.route('/api/<rig>/stop', methods=['POST'])
+def api_stop(rig=None):
     try:
-        if control_system is None:
+        if _system(rig) is None:
             return jsonify({
                 'status': 'error',
                 'message': 'Система не инициализирована'
             }), 500
 
-        control_system.stop_movement()
+        # Остановка минует очередь команд установки и прерывает текущее движение
+        _system(rig).stop_movement()
 
         return jsonify({
             'status': 'success',
@@ -197,10 +250,67 @@ def api_stop():
         }), 500
 
 
-@app.route('/api/status', methods=['GET'])
-def api_status():
+@api.route('/api/track', methods=['POST'])
+@api.route('/api/<rig>/track', methods=['POST'])
+def api_track(rig=None):
+    """Сопровождение цели: точки {'t': с, 'azimuth'/'elevation' | 'x'/'y'/'z' | углы осей}"""
     try:
-        if control_system is None:
+        if _system(rig) is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Система не инициализирована'
+            }), 500
+
+        data = request.json
+        _system(rig).track(data['samples'], float(data.get('rate_hz', 50.0)))
+
+        return jsonify({
+            'status': 'success',
+            'message': 'Сопровождение цели активно',
+            'samples': len(data['samples'])
+        })
+
+    except (ValueError, RuntimeError) as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@api.route('/api/track/stop', methods=['POST'])
+@api.route('/api/<rig>/track/stop', methods=['POST'])
+def api_track_stop(rig=None):
+    try:
+        if _system(rig) is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Система не инициализирована'
+            }), 500
+
+        _system(rig).stop_tracking()
+
+        return jsonify({
+            'status': 'success',
+            'message': 'Сопровождение цели остановлено'
+        })
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@api.route('/api/status', methods=['GET'])
+@api.route('/api/<rig>/status', methods=['GET'])
+def api_status(rig=None):
+    try:
+        if _system(rig) is None:
             return jsonify({
                 'status': 'error',
                 'message': 'Система не инициализирована'
@@ -208,9 +318,7 @@ def api_status():
 
         return jsonify({
             'status': 'operational',
-            'current_angles': control_system.current_angles,
-            'is_holding': control_system.is_holding,
-            'jog_multipliers': control_system.jog_multipliers
+            **_system(rig).get_status()
         })
 
     except Exception as e:
@@ -220,17 +328,150 @@ def api_status():
         }), 500
 
 
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/fleet/status', methods=['GET'])
+def api_fleet_status():
+    """Состояние всех установок парка"""
+    try:
+        if fleet is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Парк установок не инициализирован'
+            }), 500
+
+        return jsonify({
+            'status': 'operational',
+            'rigs': fleet.status()
+        })
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@api.route('/api/fleet/move', methods=['POST'])
+def api_fleet_move():
+    """Синхронное перемещение: {"rigs": {"<установка>": {"angles": {...}} | {"h_angle", "v_angle"}}, "speed"}"""
+    try:
+        if fleet is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Парк установок не инициализирован'
+            }), 500
+
+        data = request.json
+        try:
+            targets = {rig: _parse_coordinates(target) for rig, target in data['rigs'].items()}
+            speed = float(data.get('speed', 10.0))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            return jsonify({
+                'status': 'error',
+                'message': f'Неверный формат запроса: {e!r}'
+            }), 400
+
+        # 404 - только для неизвестных установок, ошибки разбора выше - 400
+        unknown = sorted(rig for rig in targets if rig not in fleet.rigs)
+        if unknown:
+            return jsonify({
+                'status': 'error',
+                'message': f'Установки не найдены: {unknown}'
+            }), 404
+
+        results = fleet.move_all(targets, speed)
+
+        return jsonify({
+            'status': 'success' if all(results.values()) else 'error',
+            'results': results,
+            'speed': speed
+        }), 200 if all(results.values()) else 409
+
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@api.route('/api/fleet/stop', methods=['POST'])
+def api_fleet_stop():
+    try:
+        if fleet is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Парк установок не инициализирован'
+            }), 500
+
+        fleet.stop_all()
+
+        return jsonify({
+            'status': 'success',
+            'message': 'Все установки остановлены'
+        })
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@api.route('/api/health', methods=['GET'])
 def api_health():
     """Проверка здоровья системы"""
+    initialized = control_system is not None or fleet is not None
     return jsonify({
-        'status': 'healthy' if control_system is not None else 'not_initialized',
-        'initialized': control_system is not None
+        'status': 'healthy' if initialized else 'not_initialized',
+        'initialized': initialized
     })
 
 
+@api.route('/api/ready', methods=['GET'])
+def api_ready():
+    """Готовность к приему команд: система (или все установки парка) создана и прогрета"""
+    if fleet is not None:
+        ready = fleet.is_ready
+    else:
+        ready = control_system is not None and control_system.is_ready
+    return jsonify({
+        'status': 'ready' if ready else 'starting',
+        'ready': ready,
+        'startup': startup_report
+    }), 200 if ready else 503
+
+
+def create_app(simulate=None, config_path=None, fleet_path=None):
+    """Фабрика приложения: инициализация и прогрев до приема запросов.
+
+    Без аргументов параметры берутся из окружения (STEPPER_SIMULATE,
+    STEPPER_CONFIG, STEPPER_FLEET), например для
+    `flask --app web_interface run` или `gunicorn 'web_interface:create_app()'`.
+    """
+    global control_system, fleet
+
+    if simulate is None:
+        simulate = os.environ.get('STEPPER_SIMULATE', '').lower() in ('1', 'true', 'yes')
+    config_path = config_path or os.environ.get('STEPPER_CONFIG')
+    fleet_path = fleet_path or os.environ.get('STEPPER_FLEET')
+
+    if control_system is None and fleet is None:
+        if fleet_path:
+            fleet = init_fleet(simulate=simulate, fleet_path=fleet_path)
+        else:
+            control_system = init_control_system(simulate=simulate, config_path=config_path)
+
+    app = Flask(__name__, template_folder='../templates', static_folder='../static')
+    CORS(app)  # Включаем CORS для всех доменов
+    app.register_blueprint(api)
+    return app
+
+
 if __name__ == '__main__':
     args = parse_arguments()
-    # Инициализация при прямом запуске
-    control_system = init_control_system(simulate=args.simulate)
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app = create_app(simulate=args.simulate, config_path=args.config, fleet_path=args.fleet)
+    app.run(host=args.host, port=args.port, debug=args.debug, use_reloader=False)
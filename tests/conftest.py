@@ -0,0 +1,7 @@
+# tests/conftest.py
+import os
+import sys
+
+# Модули в src импортируют друг друга напрямую (from hardware_interface import ...),
+# как при запуске python src/main.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,143 @@
+# tests/test_calibration.py
+import os
+import tempfile
+import unittest
+from src.calibration import CompensationTable, Calibrator, save_tables, load_tables
+from src.control_system import StepperControlSystem, AxisConfig
+from src.hardware_interface import HardwareInterface
+
+class NonlinearHardware(HardwareInterface):
+    """Ось с датчиком положения и синусоидальной ошибкой передачи"""
+    def __init__(self, steps_per_degree):
+        self.steps_per_degree = steps_per_degree
+        self.steps = 0
+
+    def move_axis(self, axis, steps):
+        self.steps += steps
+
+    def set_holding_torque(self, axis, enable):
+        pass
+
+    def read_endstop(self, pin):
+        return False
+
+    def emergency_stop(self):
+        pass
+
+    def cleanup(self):
+        pass
+
+    def read_position(self, axis):
+        commanded = self.steps / self.steps_per_degree
+        return commanded + 0.2 * (commanded / 90.0) ** 2
+
+class SensorlessHardware(NonlinearHardware):
+    def read_position(self, axis):
+        return None
+
+class TestCompensationTable(unittest.TestCase):
+    def test_fit_linear_error(self):
+        table = CompensationTable(0.0, 100.0, nodes=11)
+        table.fit([(a * 0.5, 0.01 * a * 0.5) for a in range(201)])
+        self.assertAlmostEqual(table.correction(37.0), 0.37, places=2)
+        self.assertAlmostEqual(table.correction(-5.0), table.correction(0.0))
+
+    def test_incremental_update(self):
+        table = CompensationTable(0.0, 100.0, nodes=11)
+        table.update(50.0, 0.3)
+        self.assertAlmostEqual(table.correction(50.0), 0.3, places=2)
+
+    def test_save_and_load(self):
+        table = CompensationTable(0.0, 100.0, nodes=11)
+        table.fit([(10.0, 0.1), (90.0, -0.1)])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'calibration.json')
+            save_tables(path, {'test_axis': table})
+            loaded = load_tables(path)['test_axis']
+        self.assertAlmostEqual(loaded.correction(42.0), table.correction(42.0))
+
+class TestCalibrator(unittest.TestCase):
+    def setUp(self):
+        axes_config = {
+            'test_axis': AxisConfig(
+                name='test_axis',
+                steps_per_degree=100.0,
+                max_angle=90.0,
+                min_angle=0.0,
+                homing_pin=1,
+                max_speed=1000.0
+            )
+        }
+        self.hw = NonlinearHardware(100.0)
+        self.system = StepperControlSystem(axes_config, self.hw)
+
+    def tearDown(self):
+        self.system.shutdown()
+
+    def test_sweep_reduces_error(self):
+        errors = dict(self.system.check_linearity('test_axis', [80.0]))
+        self.assertGreater(abs(errors[80.0]), 0.1)
+
+        Calibrator(self.system, poll_interval=0.0).calibrate_axis('test_axis', points=16, nodes=9)
+        errors = dict(self.system.check_linearity('test_axis', [80.0]))
+        self.assertLess(abs(errors[80.0]), 0.02)
+
+    def test_calibrate_scale_incremental(self):
+        self.system.calibrate_scale('test_axis', 45.0, 4400, incremental=True)
+        self.assertEqual(self.system.axes['test_axis'].steps_per_degree, 100.0)
+        self.assertAlmostEqual(self.system.compensation['test_axis'].correction(45.0), -1.0, places=2)
+
+    def test_calibrate_scale_drops_stale_table(self):
+        self.system.calibrate_scale('test_axis', 45.0, 4400, incremental=True)
+        self.system.calibrate_scale('test_axis', 45.0, 4500)
+        self.assertNotIn('test_axis', self.system.compensation)
+        self.assertEqual(self.system.axes['test_axis'].steps_per_degree, 100.0)
+
+    def test_tables_saved_to_configured_path(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'calibration.json')
+            self.system.calibration_config = {'path': path, 'sweep_points': 8, 'nodes': 5}
+            table = self.system.calibrate_axis('test_axis')
+            self.assertEqual(table.nodes, 5)
+            saved = load_tables(path)['test_axis']
+            self.assertAlmostEqual(saved.correction(60.0), table.correction(60.0))
+
+            self.system.calibrate_scale('test_axis', 45.0, 4400, incremental=True)
+            saved = load_tables(path)['test_axis']
+            self.assertAlmostEqual(saved.correction(45.0), table.correction(45.0))
+
+class TestSensorlessCalibration(unittest.TestCase):
+    def setUp(self):
+        axes_config = {
+            'test_axis': AxisConfig(name='test_axis', steps_per_degree=100.0, max_angle=90.0,
+                                    min_angle=0.0, homing_pin=1, max_speed=1000.0)
+        }
+        self.hw = SensorlessHardware(100.0)
+        self.system = StepperControlSystem(axes_config, self.hw)
+
+    def tearDown(self):
+        self.system.shutdown()
+
+    def test_calibrate_axis_keeps_existing_table(self):
+        table = CompensationTable(0.0, 90.0, nodes=9)
+        table.update(45.0, 0.5)
+        self.system.compensation['test_axis'] = table
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'calibration.json')
+            save_tables(path, self.system.compensation)
+            with open(path) as f:
+                saved = f.read()
+            self.system.calibration_config = {'path': path, 'sweep_points': 8, 'nodes': 5}
+
+            with self.assertRaises(RuntimeError):
+                self.system.calibrate_axis('test_axis')
+            with self.assertRaises(RuntimeError):
+                self.system.check_linearity('test_axis', [80.0])
+
+            self.assertIs(self.system.compensation['test_axis'], table)
+            with open(path) as f:
+                self.assertEqual(f.read(), saved)
+        self.assertEqual(self.hw.steps, 0)
+
+if __name__ == '__main__':
+    unittest.main()
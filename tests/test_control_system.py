@@ -1,7 +1,14 @@
 # tests/test_control_system.py
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import Mock
-from src.control_system import StepperControlSystem, AxisConfig
+from src.control_system import StepperControlSystem, AxisConfig, OperationMode
+from src.config import load_config, JogConfig
+from src.hardware_interface import HardwareInterface
 
 class TestStepperControlSystem(unittest.TestCase):
     def setUp(self):
@@ -37,5 +44,148 @@ class TestStepperControlSystem(unittest.TestCase):
         angle = self.system._steps_to_angle('test_axis', 9000)
         self.assertEqual(angle, 90.0)
 
+    def test_warm_up_sets_ready(self):
+        self.assertFalse(self.system.is_ready)
+        self.system.warm_up()
+        self.assertTrue(self.system.is_ready)
+        self.assertTrue(self.hw_mock.warm_up.called)
+
+class TestMultiAxis(unittest.TestCase):
+    def setUp(self):
+        self.hw_mock = Mock()
+        self.names = [f'axis{i}' for i in range(6)]
+        axes_config = {
+            name: AxisConfig(name=name, steps_per_degree=10.0, max_angle=180.0,
+                             min_angle=-180.0, homing_pin=i)
+            for i, name in enumerate(self.names)
+        }
+        self.system = StepperControlSystem(axes_config, self.hw_mock)
+
+    def tearDown(self):
+        self.system.shutdown()
+
+    def test_axis_index(self):
+        self.assertEqual(self.system.axis_index['axis3'], 3)
+        self.assertEqual(len(self.system.angles), 6)
+
+    def test_jog_config_derived_for_every_axis(self):
+        self.assertEqual(set(self.system.jog_config), set(self.names))
+        self.assertAlmostEqual(self.system.jog_config['axis5'].delta_initial, 0.1)
+
+    def test_plan_trajectory_keeps_other_axes(self):
+        trajectory = self.system.plan_trajectory({'axis2': 90.0})
+        self.assertEqual(list(trajectory[-1]), [0.0, 0.0, 90.0, 0.0, 0.0, 0.0])
+
+    def test_move_and_jog_third_axis(self):
+        self.assertTrue(self.system.move_to_coordinates({'axis2': 10.0, 'axis5': -20.0}, speed=1000.0))
+        self.system.geometric_jog('axis2', 1)
+        status = self.system.get_status()
+        self.assertAlmostEqual(status['current_angles']['axis2'], 10.1)
+        self.assertEqual(status['current_angles']['axis5'], -20.0)
+        self.assertEqual(self.system.steps[5], -200)
+        self.assertEqual(status['jog_multipliers']['axis2'], 1)
+
+class StepCountingHardware(HardwareInterface):
+    def __init__(self):
+        self.steps = 0
+        self.stopped_at = None
+
+    def move_axis(self, axis, steps):
+        self.steps += steps
+
+    def set_holding_torque(self, axis, enable):
+        pass
+
+    def read_endstop(self, pin):
+        return False
+
+    def emergency_stop(self):
+        self.stopped_at = time.monotonic()
+
+    def cleanup(self):
+        pass
+
+class TestEmergencyStop(unittest.TestCase):
+    def setUp(self):
+        self.hw = StepCountingHardware()
+        axes_config = {
+            'test_axis': AxisConfig(name='test_axis', steps_per_degree=100.0,
+                                    max_angle=360.0, min_angle=0.0, homing_pin=1)
+        }
+        self.system = StepperControlSystem(axes_config, self.hw)
+
+    def tearDown(self):
+        self.system.shutdown()
+
+    def test_stop_interrupts_running_move(self):
+        # speed=1 -> 0.1 с на точку, полный ход около 5 с
+        result = {}
+        mover = threading.Thread(target=lambda: result.setdefault(
+            'moved', self.system.move_to_coordinates({'test_axis': 90.0}, speed=1.0)))
+        mover.start()
+        time.sleep(0.3)
+        requested = time.monotonic()
+        self.system.stop_movement()
+        mover.join(timeout=2.0)
+
+        self.assertFalse(mover.is_alive())
+        self.assertLess(self.hw.stopped_at - requested, 0.05)
+        self.assertLess(time.monotonic() - requested, 0.5)
+        self.assertFalse(result['moved'])
+        self.assertLess(self.hw.steps, 9000)
+        self.assertFalse(self.system.is_position_trusted('test_axis'))
+
+        # После остановки следующее движение выполняется как обычно
+        self.assertTrue(self.system.move_to_coordinates({'test_axis': 1.0}, speed=1000.0))
+
+    def test_stop_interrupts_homing(self):
+        # Концевик не срабатывает никогда: без остановки поиск нуля бесконечен
+        errors = []
+
+        def home():
+            try:
+                self.system.home_axis('test_axis')
+            except RuntimeError as e:
+                # MotionAborted: модуль загружен и как src.hardware_interface, и как hardware_interface
+                errors.append(type(e).__name__)
+
+        homing = threading.Thread(target=home)
+        homing.start()
+        time.sleep(0.3)
+        requested = time.monotonic()
+        self.system.stop_movement()
+        homing.join(timeout=2.0)
+
+        self.assertFalse(homing.is_alive())
+        self.assertLess(time.monotonic() - requested, 0.5)
+        self.assertEqual(errors, ['MotionAborted'])
+        self.assertFalse(self.system.is_position_trusted('test_axis'))
+        self.assertEqual(self.system.mode, OperationMode.WORKING)
+
+class TestLoadConfig(unittest.TestCase):
+    def test_defaults(self):
+        config = load_config()
+        self.assertIn('horizontal', config['axes'])
+        self.assertEqual(config['backend'], 'rpi')
+
+    def test_json_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'rig.json')
+            with open(path, 'w') as f:
+                json.dump({'backend': 'simulated',
+                           'jog': {'horizontal': {'delta_initial': 0.2, 'ratio': 2.0,
+                                                  'delta_max': 8.0, 'reset_timeout': 1.0}}}, f)
+            config = load_config(path)
+        self.assertEqual(config['backend'], 'simulated')
+        self.assertEqual(config['jog']['horizontal'], JogConfig(0.2, 2.0, 8.0, 1.0))
+
+    def test_unknown_section(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'rig.json')
+            with open(path, 'w') as f:
+                json.dump({'axis': {}}, f)
+            with self.assertRaises(ValueError):
+                load_config(path)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,186 @@
+# tests/test_fleet.py
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+from src.control_system import StepperControlSystem, AxisConfig
+from src.config import load_fleet_config, merge_config
+from src.fleet import FleetController, create_rig, create_rig_hardware
+from src.hardware_interface import HardwareInterface
+from src.keep_out import build_zones
+
+
+class IdleHardware(HardwareInterface):
+    def move_axis(self, axis, steps):
+        pass
+
+    def set_holding_torque(self, axis, enable):
+        pass
+
+    def read_endstop(self, pin):
+        return False
+
+    def emergency_stop(self):
+        pass
+
+    def cleanup(self):
+        pass
+
+
+def _make_rig(started, hw=None, keep_out_zones=None):
+    if hw is not None:
+        return StepperControlSystem(_axes_config(), hw, keep_out_zones=keep_out_zones)
+    hw = Mock()
+
+    def run_schedule(schedule, interval, stop=None):
+        started.append(time.monotonic())
+        time.sleep(0.2)
+
+    hw.run_schedule.side_effect = run_schedule
+    return StepperControlSystem(_axes_config(), hw, keep_out_zones=keep_out_zones)
+
+
+def _axes_config():
+    return {
+        'horizontal': AxisConfig(name='horizontal', steps_per_degree=10.0,
+                                 max_angle=360.0, min_angle=0.0, homing_pin=5),
+        'vertical': AxisConfig(name='vertical', steps_per_degree=10.0,
+                               max_angle=90.0, min_angle=0.0, homing_pin=6)
+    }
+
+
+class TestFleetController(unittest.TestCase):
+    def setUp(self):
+        self.started = []
+        self.fleet = FleetController({name: _make_rig(self.started) for name in ('east', 'west', 'north')})
+
+    def tearDown(self):
+        self.fleet.shutdown()
+
+    def test_move_all_runs_rigs_in_parallel(self):
+        start = time.monotonic()
+        results = self.fleet.move_all({rig: {'horizontal': 10.0, 'vertical': 5.0}
+                                       for rig in self.fleet.rigs})
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results, {'east': True, 'west': True, 'north': True})
+        self.assertLess(elapsed, 0.5)
+        self.assertLess(max(self.started) - min(self.started), 0.1)
+        for system in self.fleet.rigs.values():
+            self.assertAlmostEqual(system.current_angles['horizontal'], 10.0)
+
+    def test_move_all_rejects_every_rig_on_invalid_target(self):
+        with self.assertRaises(ValueError):
+            self.fleet.move_all({'east': {'horizontal': 10.0}, 'west': {'vertical': 120.0}})
+        self.assertEqual(self.started, [])
+
+    def test_move_all_checks_after_queued_commands(self):
+        zones = build_zones([{'name': 'fixture', 'bounds': {'horizontal': [100.0, 140.0],
+                                                            'vertical': [0.0, 30.0]}}])
+        self.fleet.shutdown()
+        self.fleet = FleetController({name: _make_rig(self.started, keep_out_zones=zones)
+                                      for name in ('east', 'west')})
+        # Из (0, 0) путь к цели свободен, а из (150, 50), куда east уйдет
+        # по команде из очереди, он проходит через зону
+        queued = self.fleet.submit('east', StepperControlSystem.move_to_coordinates,
+                                   {'horizontal': 150.0, 'vertical': 50.0}, 1000.0)
+        with self.assertRaises(ValueError):
+            self.fleet.move_all({'east': {'horizontal': 90.0, 'vertical': 10.0},
+                                 'west': {'horizontal': 90.0, 'vertical': 10.0}})
+        self.assertTrue(queued.result())
+        self.assertEqual(len(self.started), 1)
+        self.assertEqual(self.fleet.rigs['west'].current_angles['horizontal'], 0.0)
+
+    def test_stop_all_interrupts_moves(self):
+        self.fleet.shutdown()
+        self.fleet = FleetController({name: _make_rig(self.started, IdleHardware())
+                                      for name in ('east', 'west')})
+        result = {}
+        # speed=1 -> 0.1 с на точку траектории, полный ход около 5 с
+        mover = threading.Thread(target=lambda: result.update(self.fleet.move_all(
+            {rig: {'horizontal': 90.0} for rig in self.fleet.rigs}, speed=1.0)))
+        mover.start()
+        time.sleep(0.3)
+        requested = time.monotonic()
+        self.fleet.stop_all()
+        mover.join(timeout=2.0)
+
+        self.assertFalse(mover.is_alive())
+        self.assertLess(time.monotonic() - requested, 0.5)
+        self.assertEqual(result, {'east': False, 'west': False})
+        for system in self.fleet.rigs.values():
+            self.assertFalse(system.is_position_trusted('horizontal'))
+
+    def test_unknown_rig(self):
+        with self.assertRaises(KeyError):
+            self.fleet.move('south', {'horizontal': 10.0})
+
+    def test_status_per_rig(self):
+        self.assertTrue(self.fleet.move('west', {'horizontal': 20.0}))
+        status = self.fleet.status()
+        self.assertEqual(set(status), {'east', 'west', 'north'})
+        self.assertAlmostEqual(status['west']['current_angles']['horizontal'], 20.0)
+        self.assertAlmostEqual(status['east']['current_angles']['horizontal'], 0.0)
+
+
+class TestCreateRig(unittest.TestCase):
+    def setUp(self):
+        # RPi.GPIO в тестовом окружении недоступен
+        self.config = merge_config({'backend': 'rpi', 'journal': {'enabled': False}})
+
+    def test_falls_back_to_simulation(self):
+        backend, _ = create_rig_hardware('east', self.config)
+        self.assertEqual(backend, 'simulated')
+        system = create_rig('east', self.config)
+        self.assertEqual(type(system.hw).__name__, 'SimulatedHardware')
+        system.shutdown()
+
+    def test_no_fallback(self):
+        with self.assertRaises(RuntimeError):
+            create_rig('east', self.config, fallback=False)
+
+
+class TestLoadFleetConfig(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name, data):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        return path
+
+    def test_rig_files_and_inline_sections(self):
+        self._write('east.json', {'backend': 'simulated'})
+        path = self._write('fleet.json', {
+            'rigs': {'east': 'east.json', 'west': {'backend': 'simulated'}},
+            'sync_timeout': 2.0
+        })
+        fleet_config = load_fleet_config(path)
+
+        self.assertEqual(set(fleet_config['rigs']), {'east', 'west'})
+        self.assertEqual(fleet_config['sync_timeout'], 2.0)
+        journals = {rig: config['journal']['path'] for rig, config in fleet_config['rigs'].items()}
+        self.assertEqual(journals, {'east': 'east_stepper_position.journal',
+                                    'west': 'west_stepper_position.journal'})
+
+    def test_shared_journal_rejected(self):
+        journal = {'enabled': True, 'path': 'shared.journal'}
+        path = self._write('fleet.json', {'rigs': {'a': {'journal': journal}, 'b': {'journal': journal}}})
+        with self.assertRaises(ValueError):
+            load_fleet_config(path)
+
+    def test_reserved_rig_name_rejected(self):
+        path = self._write('fleet.json', {'rigs': {'fleet': {}}})
+        with self.assertRaises(ValueError):
+            load_fleet_config(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
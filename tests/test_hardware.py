@@ -2,6 +2,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from src.raspberry_pi_hw import RaspberryPiHardware
+from src.hardware_interface import create_hardware
 
 class TestRaspberryPiHardware(unittest.TestCase):
     @patch('src.raspberry_pi_hw.GPIO')
@@ -21,5 +22,30 @@ class TestRaspberryPiHardware(unittest.TestCase):
         
         self.assertTrue(mock_gpio.output.called)
 
+    @patch('src.raspberry_pi_hw.GPIO')
+    def test_move_axis_cycles_phases(self, mock_gpio):
+        pin_config = {'test_axis': [1, 2, 3, 4]}
+        hardware = RaspberryPiHardware(pin_config)
+        hardware.warm_up()
+
+        hardware.move_axis('test_axis', 5)
+        self.assertEqual(hardware.phase_index['test_axis'], 1)
+        hardware.move_axis('test_axis', -2)
+        self.assertEqual(hardware.phase_index['test_axis'], 3)
+
+    @patch('src.raspberry_pi_hw.GPIO')
+    def test_set_position_seeds_phase(self, mock_gpio):
+        hardware = RaspberryPiHardware({'test_axis': [1, 2, 3, 4]})
+        hardware.set_position('test_axis', 4502)
+        self.assertEqual(hardware.phase_index['test_axis'], 2)
+        hardware.set_position('test_axis', -1)
+        self.assertEqual(hardware.phase_index['test_axis'], 3)
+
+    def test_backend_registry(self):
+        hardware = create_hardware('simulated', {'test_axis': [1, 2, 3, 4], 'endstops': [5]})
+        self.assertEqual(type(hardware).__name__, 'SimulatedHardware')
+        with self.assertRaises(ValueError):
+            create_hardware('unknown', {})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
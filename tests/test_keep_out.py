@@ -0,0 +1,86 @@
+# tests/test_keep_out.py
+import time
+import unittest
+from unittest.mock import Mock
+from src.keep_out import KeepOutIndex, build_zones
+from src.control_system import StepperControlSystem, AxisConfig
+
+ZONES = build_zones([
+    {'name': 'fixture', 'bounds': {'horizontal': [100.0, 140.0], 'vertical': [0.0, 30.0]}},
+    {'name': 'mast', 'bounds': {'horizontal': [300.0, 310.0]}},
+])
+
+class TestKeepOutIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = KeepOutIndex(ZONES, ['horizontal', 'vertical'], [0.0, 0.0], [360.0, 90.0])
+
+    def test_clear_path(self):
+        self.assertIsNone(self.index.find_collision([[10.0, 50.0, 90.0], [10.0, 20.0, 60.0]]))
+
+    def test_segment_between_valid_points_crosses_zone(self):
+        # Обе точки вне зоны, но отрезок между ними проходит через нее
+        collision = self.index.find_collision([[90.0, 150.0], [10.0, 20.0]])
+        self.assertEqual(collision, (0, 'fixture'))
+
+    def test_path_passes_above_zone(self):
+        self.assertIsNone(self.index.find_collision([[90.0, 150.0], [40.0, 40.0]]))
+
+    def test_zone_unbounded_on_other_axes(self):
+        collision = self.index.find_collision([[200.0, 250.0, 350.0], [80.0, 80.0, 80.0]])
+        self.assertEqual(collision, (1, 'mast'))
+
+    def test_unknown_axis(self):
+        with self.assertRaises(ValueError):
+            KeepOutIndex(build_zones([{'name': 'z', 'bounds': {'roll': [0, 1]}}]),
+                         ['horizontal'], [0.0], [360.0])
+
+class TestKeepOutControlSystem(unittest.TestCase):
+    def setUp(self):
+        axes_config = {
+            'horizontal': AxisConfig(name='horizontal', steps_per_degree=10.0, max_angle=360.0,
+                                     min_angle=0.0, homing_pin=5),
+            'vertical': AxisConfig(name='vertical', steps_per_degree=10.0, max_angle=90.0,
+                                   min_angle=0.0, homing_pin=6)
+        }
+        self.hw_mock = Mock()
+        self.system = StepperControlSystem(axes_config, self.hw_mock, keep_out_zones=ZONES)
+
+    def tearDown(self):
+        self.system.shutdown()
+
+    def test_move_through_zone_rejected(self):
+        self.assertTrue(self.system.move_to_coordinates({'horizontal': 90.0, 'vertical': 10.0}, speed=1000.0))
+        self.assertFalse(self.system.move_to_coordinates({'horizontal': 150.0}, speed=1000.0))
+        self.assertEqual(self.system.current_angles['horizontal'], 90.0)
+
+    def test_tracking_stream_through_zone_rejected(self):
+        samples = [{'t': 0.0, 'horizontal': 90.0, 'vertical': 10.0},
+                   {'t': 0.1, 'horizontal': 150.0, 'vertical': 10.0}]
+        with self.assertRaises(ValueError):
+            self.system.track(samples)
+        self.assertIsNone(self.system.tracker)
+
+    def test_tracking_speed_clamp_does_not_cut_zone_corner(self):
+        # Поток обходит зону сверху и справа, но горизонтальная ось медленнее
+        # цели: без проверки тактов ось срезала бы угол через зону
+        self.system.axes['horizontal'].max_speed = 50.0
+        self.system.axes['vertical'].max_speed = 100.0
+        self.system._load_axis_arrays()
+        self.assertTrue(self.system.move_to_coordinates({'horizontal': 90.0, 'vertical': 40.0}, speed=1000.0))
+
+        positions = []
+        self.hw_mock.move_axes.side_effect = lambda moves: positions.append(tuple(self.system.angles))
+        samples = [{'t': 0.0, 'horizontal': 90.0, 'vertical': 40.0},
+                   {'t': 0.6, 'horizontal': 150.0, 'vertical': 40.0},
+                   {'t': 0.7, 'horizontal': 150.0, 'vertical': 5.0}]
+        self.system.track(samples, rate_hz=100.0)
+        time.sleep(1.5)
+
+        self.assertIsNone(self.system.tracker)
+        self.assertTrue(positions)
+        inside = [p for p in positions + [tuple(self.system.angles)]
+                  if 100.0 <= p[0] <= 140.0 and p[1] <= 30.0]
+        self.assertEqual(inside, [])
+
+if __name__ == '__main__':
+    unittest.main()
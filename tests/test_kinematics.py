@@ -0,0 +1,108 @@
+# tests/test_kinematics.py
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+from src.kinematics import PanTiltKinematics, create_kinematics
+from src.control_system import StepperControlSystem, AxisConfig, OperationMode
+
+class TestPanTiltKinematics(unittest.TestCase):
+    def setUp(self):
+        self.kinematics = PanTiltKinematics('pan', 'tilt')
+
+    def test_forward_inverse_roundtrip(self):
+        angles = {'pan': [0.0, 45.0, 270.0], 'tilt': [0.0, 30.0, 60.0]}
+        x, y, z = self.kinematics.forward(angles)
+        result = self.kinematics.inverse(x, y, z)
+        for axis in angles:
+            for expected, actual in zip(angles[axis], result[axis]):
+                self.assertAlmostEqual(expected, actual)
+
+    def test_azimuth_wraps_into_pan_range(self):
+        result = self.kinematics.from_azel([-90.0], [10.0])
+        self.assertAlmostEqual(result['pan'][0], 270.0)
+
+    def test_axis_columns_pass_through(self):
+        result = self.kinematics.to_axis_angles({'pan': [10.0], 'tilt': [5.0]})
+        self.assertEqual(result, {'pan': [10.0], 'tilt': [5.0]})
+
+    def test_unknown_model(self):
+        with self.assertRaises(ValueError):
+            create_kinematics({'model': 'delta'})
+
+class TestTracking(unittest.TestCase):
+    def setUp(self):
+        axes_config = {
+            'pan': AxisConfig(name='pan', steps_per_degree=100.0, max_angle=360.0,
+                              min_angle=0.0, homing_pin=1, max_speed=1000.0),
+            'tilt': AxisConfig(name='tilt', steps_per_degree=100.0, max_angle=90.0,
+                               min_angle=0.0, homing_pin=2, max_speed=1000.0)
+        }
+        self.hw_mock = Mock()
+        self.system = StepperControlSystem(axes_config, self.hw_mock,
+                                           kinematics=PanTiltKinematics('pan', 'tilt'))
+
+    def tearDown(self):
+        self.system.shutdown()
+
+    def test_convert_cartesian_coordinates(self):
+        angles = self.system.convert_to_angles({'x': 0.0, 'y': 1.0, 'z': 1.0})
+        self.assertAlmostEqual(angles['pan'], 90.0)
+        self.assertAlmostEqual(angles['tilt'], 45.0)
+
+    def test_follows_target_stream(self):
+        samples = [{'t': t * 0.05, 'azimuth': 10.0 + t, 'elevation': 20.0} for t in range(5)]
+        self.system.track(samples, rate_hz=100.0)
+        self.assertEqual(self.system.mode, OperationMode.TRACKING)
+        time.sleep(0.4)
+        self.system.stop_tracking()
+
+        self.assertEqual(self.system.mode, OperationMode.WORKING)
+        self.assertAlmostEqual(self.system.current_angles['pan'], 14.0, places=3)
+        self.assertAlmostEqual(self.system.current_angles['tilt'], 20.0, places=3)
+
+    def test_tracking_across_north_does_not_unwind(self):
+        # Ось с запасом хода за 360°: переход 358° -> 2° продолжается до 362°
+        self.system.axes['pan'].min_angle = -180.0
+        self.system.axes['pan'].max_angle = 540.0
+        self.system._load_axis_arrays()
+        self.assertTrue(self.system.move_to_coordinates({'pan': 358.0, 'tilt': 20.0}, speed=1000.0))
+
+        positions = []
+        self.hw_mock.move_axes.side_effect = lambda moves: positions.append(self.system.angles[0])
+        samples = [{'t': t * 0.05, 'azimuth': (358.0 + t) % 360.0, 'elevation': 20.0} for t in range(5)]
+        self.system.track(samples, rate_hz=100.0)
+        time.sleep(0.4)
+        self.system.stop_tracking()
+
+        self.assertAlmostEqual(self.system.current_angles['pan'], 362.0, places=3)
+        self.assertGreaterEqual(min(positions), 358.0 - 1e-6)
+
+    def test_concurrent_track_starts_one_loop(self):
+        samples = [{'t': 0.0, 'azimuth': 10.0, 'elevation': 20.0}]
+        convert_batch = self.system.convert_batch
+
+        def slow_convert(columns):
+            time.sleep(0.02)
+            return convert_batch(columns)
+
+        self.system.convert_batch = slow_convert
+        threads = [threading.Thread(target=self.system.track, args=(samples,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        loops = [t for t in threading.enumerate() if t.name == 'target-tracker']
+        self.assertEqual(len(loops), 1)
+        self.system.stop_tracking()
+        time.sleep(0.05)
+        self.assertFalse([t for t in threading.enumerate() if t.name == 'target-tracker'])
+
+    def test_rejects_out_of_range_stream(self):
+        with self.assertRaises(ValueError):
+            self.system.track([{'t': 0.0, 'azimuth': 10.0, 'elevation': -30.0}])
+        self.assertIsNone(self.system.tracker)
+        self.assertEqual(self.system.mode, OperationMode.WORKING)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# tests/test_pigpio_wave.py
+import threading
+import time
+import unittest
+from src.pigpio_wave_hw import compile_waveform
+from src.pigpio_standin import PigpioStandIn
+from src.hardware_interface import create_hardware
+from src.control_system import StepperControlSystem, AxisConfig
+
+PIN_CONFIG = {'pan': [17, 18, 27, 22], 'tilt': [23, 24, 25, 4], 'endstops': [5, 6]}
+
+class TestCompileWaveform(unittest.TestCase):
+    def setUp(self):
+        self.masks = {'pan': [(1, 0), (2, 1), (4, 2), (8, 4)], 'tilt': [(16, 0), (32, 16), (64, 32), (128, 64)]}
+
+    def test_steps_spread_over_segment(self):
+        phase_index = {'pan': 0, 'tilt': 0}
+        pulses = compile_waveform([{'pan': 4}], 0.004, 1000.0, self.masks, phase_index)
+        self.assertEqual([pulse[2] for pulse in pulses], [1000] * 4)
+        self.assertEqual(phase_index['pan'], 0)
+
+    def test_simultaneous_steps_merged(self):
+        phase_index = {'pan': 0, 'tilt': 0}
+        pulses = compile_waveform([{'pan': 2, 'tilt': -2}], 0.0, 1000.0, self.masks, phase_index)
+        self.assertEqual(len(pulses), 2)
+        self.assertEqual(pulses[0][0], 2 | 128)
+        self.assertEqual(phase_index['tilt'], 2)
+
+    def test_step_rate_limits_segment(self):
+        phase_index = {'pan': 0, 'tilt': 0}
+        pulses = compile_waveform([{'pan': 10}], 0.001, 1000.0, self.masks, phase_index)
+        self.assertEqual(sum(pulse[2] for pulse in pulses), 10000)
+
+class TestPigpioWaveHardware(unittest.TestCase):
+    def setUp(self):
+        self.daemon = PigpioStandIn('localhost', 0, min_pulse_us=50).start()
+        self.hw = create_hardware('pigpio_wave', PIN_CONFIG, {
+            'port': self.daemon.port, 'step_rate': 10000.0, 'chunk_pulses': 40})
+
+    def tearDown(self):
+        self.hw.cleanup()
+        self.daemon.stop()
+
+    def test_double_buffered_move(self):
+        self.hw.move_axis('pan', 200)
+        stats = self.daemon.stats
+        self.assertEqual(stats['pulses_sent'], 200)
+        self.assertEqual(stats['waves_sent'], 5)
+        self.assertEqual(stats['underruns'], 0)
+        self.assertEqual(stats['short_pulses'], 0)
+        # Каждый полный шаг включает одну обмотку и выключает другую
+        self.assertEqual(sum(stats['transitions'].values()), 400)
+        self.assertEqual(self.hw.phase_index['pan'], 0)
+
+    def test_set_position_seeds_phase(self):
+        self.hw.set_position('pan', 4502)
+        self.hw.move_axis('pan', 1)
+        self.assertEqual(self.hw.phase_index['pan'], 3)
+        # Включены обмотки фазы 3 (1, 0, 0, 1): пины 17 и 22
+        self.assertEqual(self.daemon.state.levels.get(17), 1)
+        self.assertEqual(self.daemon.state.levels.get(22), 1)
+
+    def test_endstop_and_stop(self):
+        self.daemon.state.levels[5] = 1
+        self.assertTrue(self.hw.read_endstop(5))
+        self.assertFalse(self.hw.read_endstop(6))
+        self.hw.emergency_stop()
+        self.assertEqual(self.daemon.state.levels.get(17), 0)
+
+    def test_control_system_schedule(self):
+        axes_config = {
+            'pan': AxisConfig(name='pan', steps_per_degree=10.0, max_angle=360.0,
+                              min_angle=0.0, homing_pin=5),
+            'tilt': AxisConfig(name='tilt', steps_per_degree=10.0, max_angle=90.0,
+                               min_angle=0.0, homing_pin=6)
+        }
+        system = StepperControlSystem(axes_config, self.hw)
+        self.assertTrue(system.move_to_coordinates({'pan': 10.0, 'tilt': 5.0}, speed=1000.0))
+        self.assertEqual(system.current_steps, {'pan': 100, 'tilt': 50})
+        self.assertEqual(self.daemon.stats['underruns'], 0)
+        system.shutdown()
+
+    def test_control_system_stop_halts_waves(self):
+        axes_config = {
+            'pan': AxisConfig(name='pan', steps_per_degree=10.0, max_angle=360.0,
+                              min_angle=0.0, homing_pin=5)
+        }
+        self.hw.step_rate = 500.0
+        system = StepperControlSystem(axes_config, self.hw)
+        # 2000 шагов при 500 шагов/с - около 4 с движения
+        mover = threading.Thread(target=system.move_to_coordinates, args=({'pan': 200.0}, 1000.0))
+        mover.start()
+        time.sleep(0.3)
+        requested = time.monotonic()
+        system.stop_movement()
+        mover.join(timeout=2.0)
+
+        self.assertFalse(mover.is_alive())
+        self.assertLess(time.monotonic() - requested, 0.5)
+        self.assertFalse(self.daemon.state.queue)
+        self.assertLess(self.daemon.stats['pulses_sent'], 2000)
+        self.assertFalse(system.is_position_trusted('pan'))
+        system.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
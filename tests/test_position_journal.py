@@ -0,0 +1,94 @@
+# tests/test_position_journal.py
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+from src.position_journal import PositionJournal
+from src.control_system import StepperControlSystem, AxisConfig
+
+class TestPositionJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'position.journal')
+        self.axes = ['horizontal', 'vertical']
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, journal, h_angle, in_motion=False):
+        journal.write([h_angle, 10.0], [int(h_angle * 100), 1500], [True, True], in_motion)
+
+    def test_empty_journal(self):
+        journal = PositionJournal(self.path, self.axes)
+        self.assertIsNone(journal.load())
+        journal.close()
+
+    def test_latest_record_restored(self):
+        journal = PositionJournal(self.path, self.axes)
+        self._write(journal, 10.0)
+        self._write(journal, 20.0)
+        self._write(journal, 30.0)
+        journal.close()
+
+        record = PositionJournal(self.path, self.axes).load()
+        self.assertEqual(record.angles, [30.0, 10.0])
+        self.assertEqual(record.steps, [3000, 1500])
+        self.assertFalse(record.in_motion)
+
+    def test_torn_slot_falls_back_to_previous(self):
+        journal = PositionJournal(self.path, self.axes)
+        self._write(journal, 10.0)
+        self._write(journal, 20.0)
+        journal.close()
+
+        # Порча последней записи (слот 0, последовательность 2)
+        with open(self.path, 'r+b') as f:
+            f.seek(20)
+            f.write(b'\xff\xff\xff\xff')
+
+        record = PositionJournal(self.path, self.axes).load()
+        self.assertEqual(record.angles[0], 10.0)
+
+    def test_axis_layout_change_discards_journal(self):
+        journal = PositionJournal(self.path, self.axes)
+        self._write(journal, 10.0)
+        journal.close()
+
+        self.assertIsNone(PositionJournal(self.path, ['vertical', 'horizontal']).load())
+
+    def test_control_system_restores_position(self):
+        axes_config = {
+            name: AxisConfig(name=name, steps_per_degree=100.0, max_angle=360.0,
+                             min_angle=0.0, homing_pin=1)
+            for name in self.axes
+        }
+        journal = PositionJournal(self.path, self.axes)
+        self._write(journal, 45.0)
+        journal.close()
+
+        hw = Mock()
+        system = StepperControlSystem(axes_config, hw, PositionJournal(self.path, self.axes))
+        self.assertEqual(system.current_angles['horizontal'], 45.0)
+        self.assertEqual(system.current_steps['horizontal'], 4500)
+        self.assertTrue(system.is_position_trusted())
+        # Драйвер получает восстановленные шаги, чтобы выставить фазу обмоток
+        hw.set_position.assert_any_call('horizontal', 4500)
+        hw.set_position.assert_any_call('vertical', 1500)
+        system.shutdown()
+
+    def test_interrupted_move_is_untrusted(self):
+        axes_config = {
+            name: AxisConfig(name=name, steps_per_degree=100.0, max_angle=360.0,
+                             min_angle=0.0, homing_pin=1)
+            for name in self.axes
+        }
+        journal = PositionJournal(self.path, self.axes)
+        self._write(journal, 45.0, in_motion=True)
+        journal.close()
+
+        system = StepperControlSystem(axes_config, Mock(), PositionJournal(self.path, self.axes))
+        self.assertFalse(system.is_position_trusted())
+        system.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()